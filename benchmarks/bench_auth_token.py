@@ -0,0 +1,68 @@
+"""Requests/sec of `/auth/token` with concurrent clients.
+
+Compares hashing inline on the event loop (the old behaviour) against
+the hashing executor:
+
+    python -m benchmarks.bench_auth_token --concurrency 32 --requests 400
+"""
+
+import argparse
+import asyncio
+import json
+
+from benchmarks.common import (
+    BENCH_PASSWORD,
+    create_engine,
+    make_client,
+    run_load,
+    seed_users,
+)
+from fast_zero.security import get_password_hash, hashing_executor
+
+
+async def bench(args) -> dict:
+    engine = await create_engine(args.database_url)
+    await seed_users(engine, 1, get_password_hash(BENCH_PASSWORD))
+    results = {}
+
+    async with make_client(engine) as client:
+        for kind in args.executors:
+            hashing_executor.shutdown()
+            hashing_executor.kind = kind
+            hashing_executor.max_workers = args.workers
+            hashing_executor.max_pending = args.requests
+
+            results[kind] = await run_load(
+                lambda: client.post(
+                    '/auth/token',
+                    data={
+                        'username': 'bench0@bench.com',
+                        'password': BENCH_PASSWORD,
+                    },
+                ),
+                concurrency=args.concurrency,
+                total=args.requests,
+            )
+
+    hashing_executor.shutdown()
+    await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--database-url', default='sqlite+aiosqlite:///bench_auth.db'
+    )
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument(
+        '--executors', nargs='+', default=['inline', 'thread', 'process']
+    )
+
+    print(json.dumps(asyncio.run(bench(parser.parse_args())), indent=2))
+
+
+if __name__ == '__main__':
+    main()
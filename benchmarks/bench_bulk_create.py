@@ -0,0 +1,82 @@
+"""Throughput of `POST /users/` one by one vs a single `POST /users/bulk`.
+
+python -m benchmarks.bench_bulk_create --users 2000 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from itertools import count
+
+from benchmarks.common import (
+    create_engine,
+    login,
+    make_client,
+    run_load,
+    user_payload,
+)
+from fast_zero.security import hashing_executor
+
+
+async def bench(args) -> dict:
+    engine = await create_engine(args.database_url)
+    if args.workers:
+        hashing_executor.max_workers = args.workers
+    numbers = count()
+
+    async with make_client(engine) as client:
+        single = await run_load(
+            lambda: client.post(
+                '/users/', json=user_payload(next(numbers), 'single')
+            ),
+            concurrency=args.concurrency,
+            total=args.users,
+        )
+        single['users_per_second'] = single['rps']
+        token = await login(client, 'single0@bench.com')
+
+        start = time.perf_counter()
+        response = await client.post(
+            '/users/bulk',
+            headers={'Authorization': f'Bearer {token}'},
+            json={
+                'users': [user_payload(n, 'bulk') for n in range(args.users)]
+            },
+            timeout=None,
+        )
+        elapsed = time.perf_counter() - start
+        response.raise_for_status()
+
+    hashing_executor.shutdown()
+    await engine.dispose()
+    bulk = {
+        'users': len(response.json()['created']),
+        'seconds': round(elapsed, 3),
+        'users_per_second': round(args.users / elapsed, 1),
+    }
+    return {
+        'single': single,
+        'bulk': bulk,
+        'speedup': round(
+            bulk['users_per_second'] / single['users_per_second'], 1
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--database-url', default='sqlite+aiosqlite:///bench_bulk.db'
+    )
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument(
+        '--workers', type=int, help='Defaults to HASHING_WORKERS.'
+    )
+
+    print(json.dumps(asyncio.run(bench(parser.parse_args())), indent=2))
+
+
+if __name__ == '__main__':
+    main()
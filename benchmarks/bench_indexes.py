@@ -0,0 +1,100 @@
+"""Email/username lookup latency with and without the `lower()` indexes.
+
+    python -m benchmarks.bench_indexes --users 1000000
+
+Runs the same queries the login and token routes issue, first with the
+functional indexes from the migrations and then after dropping them.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from sqlalchemy import func, insert, or_, select, text
+
+from benchmarks.common import create_engine, summarize
+from fast_zero.models import User
+
+INDEXES = ('ix_users_email_lower', 'ix_users_username_lower')
+
+
+async def seed(engine, count: int, batch=50_000):
+    async with engine.begin() as conn:
+        for start in range(0, count, batch):
+            await conn.execute(
+                insert(User),
+                [
+                    {
+                        'username': f'bench{n}',
+                        'email': f'bench{n}@bench.com',
+                        'password': 'x',
+                    }
+                    for n in range(start, min(start + batch, count))
+                ],
+            )
+
+
+async def measure(engine, query_for, names: list[str]) -> dict:
+    latencies = []
+    start = time.perf_counter()
+
+    async with engine.connect() as conn:
+        for name in names:
+            query_start = time.perf_counter()
+            await conn.scalar(query_for(name))
+            latencies.append(time.perf_counter() - query_start)
+
+    return summarize(latencies, time.perf_counter() - start, 0)
+
+
+def by_email(n: int):
+    return select(User.id).where(
+        func.lower(User.email) == f'BENCH{n}@bench.com'.lower()
+    )
+
+
+def by_username_or_email(n: int):
+    return select(User.id).where(
+        or_(
+            func.lower(User.username) == f'bench{n}',
+            func.lower(User.email) == f'bench{n}@bench.com',
+        )
+    )
+
+
+async def bench(args) -> dict:
+    engine = await create_engine(args.database_url)
+    await seed(engine, args.users)
+    names = random.Random(0).choices(range(args.users), k=args.lookups)
+    queries = {'email': by_email, 'username_or_email': by_username_or_email}
+    results = {}
+
+    for name, query_for in queries.items():
+        results[f'{name}_indexed'] = await measure(engine, query_for, names)
+
+    async with engine.begin() as conn:
+        for index in INDEXES:
+            await conn.execute(text(f'DROP INDEX {index}'))
+
+    for name, query_for in queries.items():
+        results[f'{name}_scan'] = await measure(engine, query_for, names)
+
+    await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--database-url', default='sqlite+aiosqlite:///bench_indexes.db'
+    )
+    parser.add_argument('--users', type=int, default=1_000_000)
+    parser.add_argument('--lookups', type=int, default=50)
+
+    print(json.dumps(asyncio.run(bench(parser.parse_args())), indent=2))
+
+
+if __name__ == '__main__':
+    main()
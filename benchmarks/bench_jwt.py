@@ -0,0 +1,72 @@
+"""Access-token encode/decode throughput per algorithm.
+
+Also shows the cost of re-parsing a PEM key on every decode compared
+with the parsed key objects cached by KeyRing:
+
+    python -m benchmarks.bench_jwt --tokens 5000
+"""
+
+import argparse
+import json
+import time
+
+from cryptography.hazmat.primitives import serialization
+from jwt import decode, get_unverified_header
+
+from fast_zero.keys import KeyRing, generate_private_key
+
+
+def per_second(func, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return round(count / (time.perf_counter() - start), 1)
+
+
+def bench(args) -> dict:
+    rings = {'HS256': KeyRing('HS256', secret='benchmark-secret')}
+    for algorithm in ('EdDSA', 'ES256'):
+        rings[algorithm] = KeyRing(
+            algorithm, private_keys={'k1': generate_private_key(algorithm)}
+        )
+
+    claims = {'sub': 'bench0@bench.com', 'exp': int(time.time()) + 3600}
+    results = {}
+    for algorithm, key_ring in rings.items():
+        token = key_ring.sign(claims)
+        results[algorithm] = {
+            'encode_per_second': per_second(
+                lambda key_ring=key_ring: key_ring.sign(claims), args.tokens
+            ),
+            'decode_per_second': per_second(
+                lambda key_ring=key_ring, token=token: key_ring.decode(token),
+                args.tokens,
+            ),
+        }
+
+        if not key_ring.symmetric:
+            pem = key_ring.public_keys['k1'].public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+
+            def decode_with_pem(token=token, algorithm=algorithm, pem=pem):
+                get_unverified_header(token)
+                return decode(token, pem, algorithms=[algorithm])
+
+            results[algorithm]['decode_reparsing_pem_per_second'] = per_second(
+                decode_with_pem, args.tokens
+            )
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tokens', type=int, default=5000)
+
+    print(json.dumps(bench(parser.parse_args()), indent=2))
+
+
+if __name__ == '__main__':
+    main()
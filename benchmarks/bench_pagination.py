@@ -0,0 +1,71 @@
+"""Latency of `GET /users/` at page 1 vs a deep page, offset vs cursor.
+
+python -m benchmarks.bench_pagination --users 300000 --page 10000
+"""
+
+import argparse
+import asyncio
+import json
+from base64 import urlsafe_b64encode
+
+from benchmarks.common import (
+    BENCH_PASSWORD,
+    create_engine,
+    login,
+    make_client,
+    run_load,
+    seed_users,
+)
+from fast_zero.security import get_password_hash
+
+
+def cursor_for(last_id: int) -> str:
+    return urlsafe_b64encode(str(last_id).encode()).decode()
+
+
+async def bench(args) -> dict:
+    engine = await create_engine(args.database_url)
+    await seed_users(engine, args.users, get_password_hash(BENCH_PASSWORD))
+    deep_offset = (args.page - 1) * args.limit
+    queries = {
+        'offset_page_1': f'limit={args.limit}&offset=0',
+        f'offset_page_{args.page}': f'limit={args.limit}&offset={deep_offset}',
+        'cursor_page_1': f'limit={args.limit}&cursor={cursor_for(0)}',
+        f'cursor_page_{args.page}': (
+            f'limit={args.limit}&cursor={cursor_for(deep_offset)}'
+        ),
+    }
+    results = {}
+
+    async with make_client(engine) as client:
+        token = await login(client, 'bench0@bench.com')
+        headers = {'Authorization': f'Bearer {token}'}
+
+        for name, query in queries.items():
+            results[name] = await run_load(
+                lambda query=query: client.get(
+                    f'/users/?{query}', headers=headers
+                ),
+                concurrency=1,
+                total=args.requests,
+            )
+
+    await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--database-url', default='sqlite+aiosqlite:///bench_pages.db'
+    )
+    parser.add_argument('--users', type=int, default=300_000)
+    parser.add_argument('--page', type=int, default=10_000)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--requests', type=int, default=200)
+
+    print(json.dumps(asyncio.run(bench(parser.parse_args())), indent=2))
+
+
+if __name__ == '__main__':
+    main()
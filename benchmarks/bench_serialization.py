@@ -0,0 +1,93 @@
+"""Cost of serializing a 1,000-row `GET /users/` page.
+
+Compares validating ORM objects through `UserList` with dumping the
+selected columns through `FastJSONResponse`, both as a micro-benchmark
+and end to end:
+
+    python -m benchmarks.bench_serialization --rows 1000
+"""
+
+import argparse
+import asyncio
+import json
+import timeit
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.common import (
+    BENCH_PASSWORD,
+    create_engine,
+    login,
+    make_client,
+    run_load,
+    seed_users,
+)
+from fast_zero.models import User
+from fast_zero.projections import fetch_user_rows, select_user_rows
+from fast_zero.responses import FastJSONResponse, orjson
+from fast_zero.routers import users as users_router
+from fast_zero.schemas import UserList
+from fast_zero.security import get_password_hash
+
+
+async def bench(args) -> dict:
+    engine = await create_engine(args.database_url)
+    await seed_users(engine, args.rows, get_password_hash(BENCH_PASSWORD))
+
+    async with AsyncSession(engine) as session:
+        entities = (await session.scalars(select(User))).all()
+        rows = await fetch_user_rows(session, select_user_rows())
+
+    micro = {
+        'pydantic_orm_ms': timeit.timeit(
+            lambda: UserList.model_validate({
+                'users': entities
+            }).model_dump_json(),
+            number=args.repeat,
+        )
+        / args.repeat
+        * 1000,
+        'fast_rows_ms': timeit.timeit(
+            lambda: FastJSONResponse({
+                'users': [row.as_dict() for row in rows]
+            }),
+            number=args.repeat,
+        )
+        / args.repeat
+        * 1000,
+    }
+    results = {'encoder': 'orjson' if orjson else 'json', 'micro': micro}
+
+    async with make_client(engine) as client:
+        token = await login(client, 'bench0@bench.com')
+        headers = {'Authorization': f'Bearer {token}'}
+
+        for fast in (False, True):
+            users_router.settings.FAST_JSON_RESPONSES = fast
+            results['fast_json' if fast else 'default'] = await run_load(
+                lambda: client.get(
+                    f'/users/?limit={args.rows}', headers=headers
+                ),
+                concurrency=1,
+                total=args.requests,
+            )
+
+    await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--database-url', default='sqlite+aiosqlite:///bench_json.db'
+    )
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=100)
+
+    print(json.dumps(asyncio.run(bench(parser.parse_args())), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Cold-start cost of a worker: importing the app and its first request.
+
+Each run is a fresh interpreter, so module imports, settings parsing and
+engine construction are all paid again, as they are on worker boot:
+
+    python -m benchmarks.bench_startup --runs 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import asyncio, json, time
+
+start = time.perf_counter()
+from fast_zero.app import create_app
+imported = time.perf_counter()
+
+from httpx import ASGITransport, AsyncClient
+
+
+async def first_request():
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        started = time.perf_counter()
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url='http://b') as c:
+            (await c.get('/')).raise_for_status()
+        return started, time.perf_counter()
+
+
+started, answered = asyncio.run(first_request())
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'startup_ms': (started - imported) * 1000,
+    'first_request_ms': (answered - started) * 1000,
+}))
+"""
+
+
+def probe_env() -> dict:
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', 'sqlite+aiosqlite:///:memory:')
+    env.setdefault('SECRET_KEY', 'benchmark-secret')
+    env.setdefault('ALGORITHM', 'HS256')
+    env.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+    return env
+
+
+def bench(args) -> dict:
+    env = probe_env()
+    samples = [
+        json.loads(
+            subprocess.run(
+                [sys.executable, '-c', PROBE],
+                env=env,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(args.runs)
+    ]
+
+    return {
+        metric: {
+            'median_ms': round(
+                statistics.median(sample[metric] for sample in samples), 2
+            ),
+            'max_ms': round(max(sample[metric] for sample in samples), 2),
+        }
+        for metric in samples[0]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=20)
+
+    print(json.dumps(bench(parser.parse_args()), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault('DATABASE_URL', 'sqlite+aiosqlite:///:memory:')
+os.environ.setdefault('SECRET_KEY', 'benchmark-secret')
+os.environ.setdefault('ALGORITHM', 'HS256')
+os.environ.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+os.environ.setdefault('LOGIN_RATE_LIMIT_PER_IP', '1000000000')
+os.environ.setdefault('LOGIN_RATE_LIMIT_PER_EMAIL', '1000000000')
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from fast_zero.app import app  # noqa: E402
+from fast_zero.database import (  # noqa: E402
+    get_session,
+    get_session_factory,
+)
+from fast_zero.models import User, table_registry  # noqa: E402
+
+BENCH_PASSWORD = 'benchmark'
+
+
+async def create_engine(database_url: str):
+    engine = create_async_engine(database_url)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.drop_all)
+        await conn.run_sync(table_registry.metadata.create_all)
+
+    return engine
+
+
+def make_client(engine) -> AsyncClient:
+    async def get_session_override():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+
+    return AsyncClient(
+        transport=ASGITransport(app=app), base_url='http://bench'
+    )
+
+
+async def seed_users(engine, count: int, password_hash: str, batch=10_000):
+    async with AsyncSession(engine) as session:
+        for start in range(0, count, batch):
+            session.add_all([
+                User(
+                    username=f'bench{n}',
+                    email=f'bench{n}@bench.com',
+                    password=password_hash,
+                )
+                for n in range(start, min(start + batch, count))
+            ])
+            await session.commit()
+
+
+def user_payload(n: int, prefix='new') -> dict:
+    return {
+        'username': f'{prefix}{n}',
+        'email': f'{prefix}{n}@bench.com',
+        'password': BENCH_PASSWORD,
+    }
+
+
+async def login(client: AsyncClient, email: str) -> str:
+    response = await client.post(
+        '/auth/token',
+        data={'username': email, 'password': BENCH_PASSWORD},
+    )
+    response.raise_for_status()
+    return response.json()['access_token']
+
+
+def summarize(latencies: list[float], elapsed: float, errors: int) -> dict:
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(cuts[49] * 1000, 2),
+        'p95_ms': round(cuts[94] * 1000, 2),
+        'p99_ms': round(cuts[98] * 1000, 2),
+    }
+
+
+async def run_load(send, *, concurrency: int, total: int) -> dict:
+    latencies = []
+    errors = 0
+    pending = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in pending:
+            start = time.perf_counter()
+            response = await send()
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:  # noqa: PLR2004
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return summarize(latencies, time.perf_counter() - start, errors)
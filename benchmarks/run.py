@@ -0,0 +1,180 @@
+"""Load-test the API in-process and store the results as JSON.
+
+python -m benchmarks.run --concurrency 16 --requests 500
+python -m benchmarks.run --database-url postgresql+psycopg://...
+python -m benchmarks.run --compare benchmarks/results/old.json new.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from itertools import count
+from pathlib import Path
+
+from benchmarks.common import (
+    BENCH_PASSWORD,
+    create_engine,
+    login,
+    make_client,
+    run_load,
+    seed_users,
+    user_payload,
+)
+from fast_zero.security import get_password_hash, hashing_executor
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+SCENARIOS = (
+    'auth_token',
+    'auth_refresh_token',
+    'list_users',
+    'read_user',
+    'create_user',
+    'update_user',
+)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def build_requests(client, token: str, user_id: int) -> dict:
+    headers = {'Authorization': f'Bearer {token}'}
+    created = count()
+    updated = count()
+
+    return {
+        'auth_token': lambda: client.post(
+            '/auth/token',
+            data={
+                'username': 'bench0@bench.com',
+                'password': BENCH_PASSWORD,
+            },
+        ),
+        'auth_refresh_token': lambda: client.post(
+            '/auth/refresh_token', headers=headers
+        ),
+        'list_users': lambda: client.get('/users/?limit=50', headers=headers),
+        'read_user': lambda: client.get(f'/users/{user_id}'),
+        'create_user': lambda: client.post(
+            '/users/', json=user_payload(next(created))
+        ),
+        'update_user': lambda: client.put(
+            f'/users/{user_id}',
+            headers=headers,
+            json={
+                'username': f'updated{next(updated)}',
+                'email': 'bench0@bench.com',
+                'password': BENCH_PASSWORD,
+            },
+        ),
+    }
+
+
+async def bench(args) -> dict:
+    engine = await create_engine(args.database_url)
+    await seed_users(
+        engine, args.seed_users, get_password_hash(BENCH_PASSWORD)
+    )
+    hashing_executor.max_pending = max(
+        hashing_executor.max_pending, args.concurrency
+    )
+    results = {}
+
+    async with make_client(engine) as client:
+        token = await login(client, 'bench0@bench.com')
+        requests = build_requests(client, token, user_id=1)
+
+        for scenario in args.scenarios:
+            results[scenario] = await run_load(
+                requests[scenario],
+                concurrency=args.concurrency,
+                total=args.requests,
+            )
+
+    hashing_executor.shutdown()
+    await engine.dispose()
+
+    return {
+        'commit': git_commit(),
+        'created_at': datetime.now(tz=timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'database': engine.url.get_backend_name(),
+        'concurrency': args.concurrency,
+        'requests': args.requests,
+        'scenarios': results,
+    }
+
+
+def compare(baseline_path: Path, current_path: Path, tolerance: float):
+    baseline = json.loads(baseline_path.read_text())['scenarios']
+    current = json.loads(current_path.read_text())['scenarios']
+    regressions = 0
+
+    print(
+        f'{"scenario":<20}{"metric":<8}'
+        f'{"before":>10}{"after":>10}{"change":>9}'
+    )
+    for scenario in sorted(baseline.keys() & current.keys()):
+        for metric in ('rps', 'p50_ms', 'p95_ms', 'p99_ms'):
+            before = baseline[scenario][metric]
+            after = current[scenario][metric]
+            change = (after - before) / before if before else 0.0
+            worse = -change if metric == 'rps' else change
+            flag = ' !' if worse > tolerance else ''
+            regressions += bool(flag)
+            print(
+                f'{scenario:<20}{metric:<8}{before:>10}{after:>10}'
+                f'{change:>+9.1%}{flag}'
+            )
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--database-url', default='sqlite+aiosqlite:///bench_suite.db'
+    )
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--seed-users', type=int, default=1000)
+    parser.add_argument(
+        '--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS
+    )
+    parser.add_argument('--output', type=Path)
+    parser.add_argument(
+        '--compare', nargs=2, type=Path, metavar=('BASELINE', 'CURRENT')
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.1,
+        help='relative slowdown that counts as a regression',
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.tolerance) else 0)
+
+    results = asyncio.run(bench(args))
+    output = args.output or RESULTS_DIR / f'{results["commit"]}.json'
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(json.dumps(results['scenarios'], indent=2))
+    print(f'Results written to {output}')
+
+
+if __name__ == '__main__':
+    main()
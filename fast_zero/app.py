@@ -1,14 +1,66 @@
-from HTTP import HTTPStatus
-from fast_zero.fast_zero.schemas import Message
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+from fast_zero.schemas import Message
 from fast_zero.routers import users, auth
+from fast_zero.compression import compression_middleware
+from fast_zero.database import database, read_your_writes_middleware
+from fast_zero.instrumentation import query_stats_middleware
+from fast_zero.metrics import metrics_middleware, registry
+from fast_zero.security import hashing_executor, key_ring, login_tracker
+from fast_zero.settings import get_settings
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
-app = FastAPI()
 
-app.include_router(users.router)
-app.include_router(auth.router)
+def create_app() -> FastAPI:
+    settings = get_settings()
 
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        database.start(settings)
+        if settings.WARM_ON_STARTUP:
+            await database.warm(settings.DATABASE_POOL_SIZE)
+            await hashing_executor.warm()
+        login_tracker.start(database.session_factory)
+        yield
+        await login_tracker.stop()
+        await database.dispose()
+        hashing_executor.shutdown()
 
-@app.get('/', status_code=HTTPStatus.OK, response_model=Message)
-async def read_root():
-    return {'message': 'Olá Mundo!'}
+    app = FastAPI(lifespan=lifespan)
+    app.middleware('http')(compression_middleware)
+    app.middleware('http')(read_your_writes_middleware)
+    app.middleware('http')(query_stats_middleware)
+    app.middleware('http')(metrics_middleware)
+
+    app.include_router(users.router)
+    app.include_router(auth.router)
+
+    @app.get('/', status_code=HTTPStatus.OK, response_model=Message)
+    async def read_root():
+        return {'message': 'Olá Mundo!'}
+
+    @app.get('/metrics', include_in_schema=False)
+    async def read_metrics():
+        return PlainTextResponse(
+            registry.render(), media_type='text/plain; version=0.0.4'
+        )
+
+    @app.get('/.well-known/jwks.json', status_code=HTTPStatus.OK)
+    async def read_jwks():
+        return key_ring.jwks()
+
+    return app
+
+
+# Built on first access, so `create_app` workers (see fast_zero.server) do
+# not pay for a second app. `fastapi dev` and the tests use `app`.
+def __getattr__(name: str):
+    if name == 'app':
+        globals()['app'] = create_app()
+        return globals()['app']
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return [*globals(), 'app']
@@ -0,0 +1,124 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from fast_zero.metrics import Counter, registry
+
+response_cache_requests = registry.register(
+    Counter(
+        'response_cache_requests_total',
+        'Response cache lookups by cache name and result.',
+        ('cache', 'result'),
+    )
+)
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key):
+        entry = self._data.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.time():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, expires_at: float | None = None):
+        deadline = time.time() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+
+        self._data[key] = (value, deadline)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key):
+        self._data.pop(key, None)
+
+    def discard_where(self, predicate):
+        stale = [
+            key for key, (value, _) in self._data.items() if predicate(value)
+        ]
+        for key in stale:
+            del self._data[key]
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+        }
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float): ...
+
+    @abstractmethod
+    async def delete(self, key: str): ...
+
+    @abstractmethod
+    async def clear(self): ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, maxsize: int):
+        self._cache = TTLCache(maxsize=maxsize, ttl=float('inf'))
+
+    async def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        self._cache.set(key, value, expires_at=time.time() + ttl)
+
+    async def delete(self, key: str):
+        self._cache.delete(key)
+
+    async def clear(self):
+        self._cache.clear()
+
+
+class ResponseCache:
+    def __init__(self, name: str, backend: CacheBackend, ttl: float):
+        self.name = name
+        self.backend = backend
+        self.ttl = ttl
+
+    async def get(self, key: str) -> bytes | None:
+        value = await self.backend.get(key)
+        response_cache_requests.inc(
+            cache=self.name, result='miss' if value is None else 'hit'
+        )
+        return value
+
+    async def set(self, key: str, value: bytes):
+        await self.backend.set(key, value, self.ttl)
+
+    async def invalidate(self, key: str):
+        await self.backend.delete(key)
@@ -0,0 +1,62 @@
+import argparse
+import statistics
+import time
+
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+
+def measure_ms(
+    time_cost: int, memory_cost: int, parallelism: int, samples: int = 5
+) -> float:
+    hasher = Argon2Hasher(
+        time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism
+    )
+    durations = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash('calibration-password')
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+def calibrate(
+    target_ms: float,
+    memory_cost: int,
+    parallelism: int,
+    max_time_cost: int = 32,
+) -> dict:
+    best = None
+    for time_cost in range(1, max_time_cost + 1):
+        elapsed = measure_ms(time_cost, memory_cost, parallelism)
+        candidate = {
+            'ARGON2_TIME_COST': time_cost,
+            'ARGON2_MEMORY_COST': memory_cost,
+            'ARGON2_PARALLELISM': parallelism,
+            'measured_ms': round(elapsed, 1),
+        }
+        if best is None or abs(elapsed - target_ms) < abs(
+            best['measured_ms'] - target_ms
+        ):
+            best = candidate
+        if elapsed >= target_ms:
+            break
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Pick Argon2 parameters that hash in about --target-ms.'
+    )
+    parser.add_argument('--target-ms', type=float, default=250)
+    parser.add_argument('--memory-cost', type=int, default=65536)
+    parser.add_argument('--parallelism', type=int, default=4)
+    args = parser.parse_args()
+
+    result = calibrate(args.target_ms, args.memory_cost, args.parallelism)
+    print(f'# {result.pop("measured_ms")} ms per hash on this machine')
+    for name, value in result.items():
+        print(f'{name}={value}')
+
+
+if __name__ == '__main__':
+    main()
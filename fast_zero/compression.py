@@ -0,0 +1,88 @@
+import gzip
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from fast_zero.settings import get_settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (
+    'application/json',
+    'application/x-ndjson',
+    'text/',
+)
+
+# Server preference, best ratio/speed first; gzip is always available.
+ENCODERS = {}
+if zstandard is not None:
+    ENCODERS['zstd'] = zstandard.ZstdCompressor(level=3).compress
+if brotli is not None:
+    ENCODERS['br'] = lambda body: brotli.compress(body, quality=4)
+ENCODERS['gzip'] = lambda body: gzip.compress(body, compresslevel=6)
+
+
+def choose_encoding(accept_encoding: str | None) -> str | None:
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    for encoding in ENCODERS:
+        if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+
+def _is_compressible(response: Response) -> bool:
+    content_type = response.headers.get('content-type', '')
+    return (
+        content_type.startswith(COMPRESSIBLE_TYPES)
+        and 'content-encoding' not in response.headers
+        and 'content-length' in response.headers
+    )
+
+
+async def compression_middleware(request: Request, call_next):
+    response = await call_next(request)
+
+    if request.method == 'HEAD' or not _is_compressible(response):
+        return response
+
+    response.headers.append('Vary', 'Accept-Encoding')
+    length = int(response.headers['content-length'])
+    encoding = choose_encoding(request.headers.get('accept-encoding'))
+    if encoding is None or length < get_settings().COMPRESSION_MIN_SIZE:
+        return response
+
+    body = b''.join([chunk async for chunk in response.body_iterator])
+    compressed = ENCODERS[encoding](body)
+
+    result = Response(compressed, status_code=response.status_code)
+    result.raw_headers = [
+        (name, value)
+        for name, value in response.raw_headers
+        if name != b'content-length'
+    ]
+    result.headers['Content-Length'] = str(len(compressed))
+    result.headers['Content-Encoding'] = encoding
+    etag = result.headers.get('etag')
+    if etag and not etag.startswith('W/'):
+        # The bytes differ per encoding, so the tag can no longer be strong.
+        result.headers['ETag'] = f'W/{etag}'
+    return result
@@ -1,10 +1,247 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+import asyncio
+import time
+from contextvars import ContextVar
+
+from fastapi import Request
+from sqlalchemy import Select, make_url, text
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from fast_zero.metrics import CallbackGauge, registry
+from fast_zero.settings import Settings, get_settings
+
+
+class PoolWaits:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+
+pool_waits = PoolWaits()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_waits.observe(time.perf_counter() - start)
+
+
+def engine_options(settings: Settings, url: str | None = None) -> dict:
+    url = make_url(url or settings.DATABASE_URL)
+    in_memory = url.database in {None, '', ':memory:'}
+    if url.get_backend_name() == 'sqlite' and in_memory:
+        return {}
+
+    return {
+        'poolclass': InstrumentedPool,
+        'pool_size': settings.DATABASE_POOL_SIZE,
+        'max_overflow': settings.DATABASE_MAX_OVERFLOW,
+        'pool_pre_ping': settings.DATABASE_POOL_PRE_PING,
+        'pool_recycle': settings.DATABASE_POOL_RECYCLE,
+        'pool_timeout': settings.DATABASE_POOL_TIMEOUT,
+    }
+
+
+PRIMARY_COOKIE = 'fz_primary_until'
+
+
+class ReadYourWrites:
+    __slots__ = ('sticky', 'wrote')
+
+    def __init__(self, sticky=False):
+        self.sticky = sticky
+        self.wrote = False
+
+
+read_your_writes: ContextVar[ReadYourWrites | None] = ContextVar(
+    'read_your_writes', default=None
+)
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kw):
+        primary = self.info['primary']
+        state = read_your_writes.get()
+        reads_from_replica = (
+            isinstance(clause, Select)
+            and clause._for_update_arg is None
+            and not self._flushing
+            and not self.info.get('wrote')
+            and not (state is not None and state.sticky)
+        )
+        if reads_from_replica:
+            return self.info['replica']
+
+        if not isinstance(clause, Select):
+            self.info['wrote'] = True
+            if state is not None:
+                state.wrote = True
+        return primary
+
+
+def use_primary(session: AsyncSession):
+    """Route the rest of `session`, reads included, to the primary.
+
+    For requests that load rows in order to change them: a lagging
+    replica may not have the row yet, or may hand the ORM stale values.
+    """
+    session.sync_session.info['wrote'] = True
+
 
-from fast_zero.settings import Settings
+def session_options(primary, replica=None) -> dict:
+    if replica is None:
+        return {'bind': primary, 'expire_on_commit': False}
+
+    return {
+        'sync_session_class': RoutingSession,
+        'expire_on_commit': False,
+        'info': {
+            'primary': primary.sync_engine,
+            'replica': replica.sync_engine,
+        },
+    }
+
+
+class Database:
+    def __init__(self):
+        self.engine = None
+        self.read_engine = None
+        self.session_factory = None
+
+    def start(self, settings: Settings):
+        if self.engine is not None:
+            return
+
+        self.engine = create_async_engine(
+            settings.DATABASE_URL, **engine_options(settings)
+        )
+        if settings.DATABASE_READ_URL:
+            self.read_engine = create_async_engine(
+                settings.DATABASE_READ_URL,
+                **engine_options(settings, settings.DATABASE_READ_URL),
+            )
+        self.session_factory = async_sessionmaker(
+            **session_options(self.engine, self.read_engine)
+        )
+
+    async def warm(self, connections: int):
+        async def ping():
+            async with self.engine.connect() as conn:
+                await conn.execute(text('SELECT 1'))
+
+        await asyncio.gather(*(ping() for _ in range(connections)))
+
+    async def dispose(self):
+        for engine in (self.engine, self.read_engine):
+            if engine is not None:
+                await engine.dispose()
+
+        self.engine = None
+        self.read_engine = None
+        self.session_factory = None
+
+
+database = Database()
+
+
+def pool_stats() -> dict:
+    stats = {
+        'checkouts': pool_waits.count,
+        'wait_seconds_total': pool_waits.total,
+        'wait_seconds_max': pool_waits.max,
+    }
+
+    pool = database.engine.pool if database.engine is not None else None
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+
+    return stats
+
+
+def _pool_samples():
+    stats = pool_stats()
+    for state in ('checked_in', 'checked_out', 'overflow'):
+        if state in stats:
+            yield {'state': state}, stats[state]
+
+
+def _pool_wait_samples():
+    stats = pool_stats()
+    yield {'stat': 'total'}, stats['wait_seconds_total']
+    yield {'stat': 'max'}, stats['wait_seconds_max']
+
+
+registry.register(
+    CallbackGauge(
+        'db_pool_connections',
+        'Database pool connections by state.',
+        _pool_samples,
+        ('state',),
+    )
+)
+registry.register(
+    CallbackGauge(
+        'db_pool_checkouts',
+        'Connections checked out of the database pool since start.',
+        lambda: [({}, pool_stats()['checkouts'])],
+    )
+)
+registry.register(
+    CallbackGauge(
+        'db_pool_wait_seconds',
+        'Time spent waiting for a pooled connection.',
+        _pool_wait_samples,
+        ('stat',),
+    )
+)
 
-engine = create_async_engine(Settings().DATABASE_URL)
 
 async def get_session():  # pragma: no cover
-    async with AsyncSession(engine, expire_on_commit=False) as session:
-        yield session
\ No newline at end of file
+    async with database.session_factory() as session:
+        yield session
+
+
+def get_session_factory():  # pragma: no cover
+    return database.session_factory
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    sticky_until = request.cookies.get(PRIMARY_COOKIE, '')
+    state = ReadYourWrites(
+        sticky=sticky_until.isdigit() and int(sticky_until) > time.time()
+    )
+    token = read_your_writes.set(state)
+    try:
+        response = await call_next(request)
+    finally:
+        read_your_writes.reset(token)
+
+    if state.wrote:
+        window = get_settings().READ_YOUR_WRITES_SECONDS
+        response.set_cookie(
+            PRIMARY_COOKIE,
+            str(int(time.time()) + window),
+            max_age=window,
+            httponly=True,
+            samesite='lax',
+        )
+    return response
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from http import HTTPStatus
+
+from fastapi import HTTPException
+
+from fast_zero.metrics import hashing_latency
+
+
+class HashingExecutor:
+    def __init__(self, kind: str, max_workers: int, max_pending: int):
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == 'process':
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='hashing',
+                )
+        return self._executor
+
+    def _check_capacity(self, jobs: int = 1):
+        if self.pending + jobs > self.max_pending:
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail='Server busy, try again later',
+                headers={'Retry-After': '1'},
+            )
+
+    async def run(self, func, *args):
+        start = time.perf_counter()
+
+        if self.kind == 'inline':
+            result = func(*args)
+        else:
+            self._check_capacity()
+            self.pending += 1
+            try:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self._get_executor(), func, *args
+                )
+            finally:
+                self.pending -= 1
+
+        hashing_latency.observe(
+            time.perf_counter() - start, operation=func.__name__
+        )
+        return result
+
+    async def map(self, func, items):
+        if self.kind == 'inline':
+            return [func(item) for item in items]
+
+        # Submit the batch in windows that fit the free capacity, at most
+        # one job per worker at a time: more would only queue, and a large
+        # batch would crowd out the single hashes of other requests.
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        results = []
+        while len(results) < len(items):
+            self._check_capacity()
+            size = min(self.max_workers, self.max_pending - self.pending)
+            window = items[len(results) : len(results) + size]
+            self.pending += len(window)
+            try:
+                results.extend(
+                    await asyncio.gather(
+                        *(
+                            loop.run_in_executor(executor, func, item)
+                            for item in window
+                        )
+                    )
+                )
+            finally:
+                self.pending -= len(window)
+        return results
+
+    async def warm(self):
+        if self.kind == 'inline':
+            return
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, int)
+                for _ in range(self.max_workers)
+            )
+        )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
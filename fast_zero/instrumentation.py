@@ -0,0 +1,126 @@
+import re
+import time
+from contextvars import ContextVar
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SERVER_TIMING_QUERIES = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+class QueryStats:
+    __slots__ = ('count', 'seconds', 'slowest_seconds', 'slowest_statement')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement = None
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.seconds * 1000:.2f};desc="{self.count} queries", '
+            f'db-slowest;dur={self.slowest_seconds * 1000:.2f}'
+        )
+
+
+class QueryReport:
+    def __init__(self):
+        self.routes = {}
+
+    def add(self, route: str, stats: QueryStats):
+        entry = self.routes.setdefault(
+            route,
+            {
+                'requests': 0,
+                'queries': 0,
+                'max_queries': 0,
+                'db_seconds': 0.0,
+                'slowest_seconds': 0.0,
+                'slowest_statement': None,
+            },
+        )
+        entry['requests'] += 1
+        entry['queries'] += stats.count
+        entry['max_queries'] = max(entry['max_queries'], stats.count)
+        entry['db_seconds'] += stats.seconds
+        if stats.slowest_seconds >= entry['slowest_seconds']:
+            entry['slowest_seconds'] = stats.slowest_seconds
+            entry['slowest_statement'] = stats.slowest_statement
+
+    def snapshot(self) -> dict:
+        return {route: dict(entry) for route, entry in self.routes.items()}
+
+    def clear(self):
+        self.routes.clear()
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    'current_query_stats', default=None
+)
+query_report = QueryReport()
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, *args):
+    conn.info.setdefault('query_started_at', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, *args):
+    started_at = conn.info['query_started_at'].pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started_at)
+
+
+@event.listens_for(Engine, 'handle_error')
+def _handle_error(context):
+    # `after_cursor_execute` is skipped when the statement raises; drop the
+    # start time so it does not pile up on the pooled connection.
+    conn = context.connection
+    if conn is None or context.execution_context is None:
+        return
+    started = conn.info.get('query_started_at')
+    if started:
+        started_at = started.pop()
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.record(context.statement, time.perf_counter() - started_at)
+
+
+def route_path(request: Request) -> str:
+    route = request.scope.get('route')
+    return route.path if route is not None else '<unmatched>'
+
+
+def route_name(request: Request) -> str:
+    return f'{request.method} {route_path(request)}'
+
+
+def parse_query_count(server_timing: str) -> int:
+    match = SERVER_TIMING_QUERIES.search(server_timing)
+    if match is None:
+        raise ValueError(f'No query count in {server_timing!r}')
+    return int(match.group(1))
+
+
+async def query_stats_middleware(request: Request, call_next):
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        current_query_stats.reset(token)
+
+    query_report.add(route_name(request), stats)
+    response.headers['Server-Timing'] = stats.server_timing()
+    return response
@@ -0,0 +1,140 @@
+import argparse
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from jwt import DecodeError, decode, encode, get_unverified_header
+from jwt.algorithms import get_default_algorithms
+
+from fast_zero.settings import Settings
+
+PUBLIC_SUFFIX = '.pub.pem'
+PRIVATE_SUFFIX = '.pem'
+
+
+def generate_private_key(algorithm: str):
+    if algorithm == 'EdDSA':
+        return ed25519.Ed25519PrivateKey.generate()
+    if algorithm == 'ES256':
+        return ec.generate_private_key(ec.SECP256R1())
+    raise ValueError(f'Unsupported asymmetric algorithm {algorithm}')
+
+
+class KeyRing:
+    def __init__(
+        self,
+        algorithm: str,
+        secret: str | None = None,
+        private_keys: dict | None = None,
+        public_keys: dict | None = None,
+        active_kid: str | None = None,
+    ):
+        self.algorithm = algorithm
+        self.secret = secret
+        self.private_keys = private_keys or {}
+        self.public_keys = {
+            kid: key.public_key() for kid, key in self.private_keys.items()
+        }
+        self.public_keys.update(public_keys or {})
+        self.active_kid = active_kid or max(self.private_keys, default=None)
+
+        if self.symmetric and not secret:
+            raise ValueError(f'{algorithm} needs SECRET_KEY')
+        if not self.symmetric and self.active_kid not in self.private_keys:
+            raise ValueError(f'No private key for kid {self.active_kid!r}')
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> 'KeyRing':
+        if settings.ALGORITHM.startswith('HS') or not settings.JWT_KEYS_DIR:
+            return cls(settings.ALGORITHM, secret=settings.SECRET_KEY)
+
+        private_keys, public_keys = {}, {}
+        for path in sorted(Path(settings.JWT_KEYS_DIR).glob('*.pem')):
+            if path.name.endswith(PUBLIC_SUFFIX):
+                kid = path.name.removesuffix(PUBLIC_SUFFIX)
+                public_keys[kid] = serialization.load_pem_public_key(
+                    path.read_bytes()
+                )
+            else:
+                kid = path.name.removesuffix(PRIVATE_SUFFIX)
+                private_keys[kid] = serialization.load_pem_private_key(
+                    path.read_bytes(), password=None
+                )
+
+        return cls(
+            settings.ALGORITHM,
+            private_keys=private_keys,
+            public_keys=public_keys,
+            active_kid=settings.JWT_ACTIVE_KID,
+        )
+
+    @property
+    def symmetric(self) -> bool:
+        return self.algorithm.startswith('HS')
+
+    def sign(self, claims: dict) -> str:
+        if self.symmetric:
+            return encode(claims, self.secret, algorithm=self.algorithm)
+
+        return encode(
+            claims,
+            self.private_keys[self.active_kid],
+            algorithm=self.algorithm,
+            headers={'kid': self.active_kid},
+        )
+
+    def verification_key(self, token: str):
+        if self.symmetric:
+            return self.secret
+
+        kid = get_unverified_header(token).get('kid')
+        if not isinstance(kid, str) or kid not in self.public_keys:
+            raise DecodeError(f'Unknown key id {kid!r}')
+        return self.public_keys[kid]
+
+    def decode(self, token: str) -> dict:
+        return decode(
+            token, self.verification_key(token), algorithms=[self.algorithm]
+        )
+
+    def jwks(self) -> dict:
+        if self.symmetric:
+            return {'keys': []}
+
+        to_jwk = get_default_algorithms()[self.algorithm].to_jwk
+        keys = []
+        for kid, public_key in self.public_keys.items():
+            jwk = to_jwk(public_key, as_dict=True)
+            jwk.update(kid=kid, use='sig', alg=self.algorithm)
+            keys.append(jwk)
+
+        return {'keys': keys}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate a signing key for JWT_KEYS_DIR.'
+    )
+    parser.add_argument('kid')
+    parser.add_argument(
+        '--algorithm', choices=['EdDSA', 'ES256'], required=True
+    )
+    parser.add_argument('--keys-dir', type=Path, default=Path('keys'))
+    args = parser.parse_args()
+
+    args.keys_dir.mkdir(parents=True, exist_ok=True)
+    key = generate_private_key(args.algorithm)
+    path = args.keys_dir / f'{args.kid}{PRIVATE_SUFFIX}'
+    path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    path.chmod(0o600)
+    print(f'Wrote {path}; set JWT_ACTIVE_KID={args.kid} to sign with it.')
+
+
+if __name__ == '__main__':
+    main()
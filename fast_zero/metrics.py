@@ -0,0 +1,215 @@
+import math
+import time
+from bisect import bisect_left
+
+from fastapi import Request
+
+from fast_zero.instrumentation import route_path
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float) and math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value)
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(
+            name,
+            str(value)
+            .replace('\\', r'\\')
+            .replace('"', r'\"')
+            .replace('\n', r'\n'),
+        )
+        for name, value in labels.items()
+    )
+    return '{' + pairs + '}'
+
+
+class Metric:
+    type = 'untyped'
+
+    def __init__(self, name: str, help_text: str, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.values = {}
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def samples(self):
+        for key, value in self.values.items():
+            yield self.name, dict(zip(self.label_names, key)), value
+
+    def render(self) -> list[str]:
+        lines = [
+            f'# HELP {self.name} {self.help_text}',
+            f'# TYPE {self.name} {self.type}',
+        ]
+        lines.extend(
+            f'{name}{_format_labels(labels)} {_format_value(value)}'
+            for name, labels, value in self.samples()
+        )
+        return lines
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        self.values[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class CallbackGauge(Metric):
+    type = 'gauge'
+
+    def __init__(self, name: str, help_text: str, callback, label_names=()):
+        super().__init__(name, help_text, label_names)
+        self.callback = callback
+
+    def samples(self):
+        for labels, value in self.callback():
+            yield self.name, labels, value
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names=(),
+        buckets=DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        series = self.values.get(key)
+        if series is None:
+            series = self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[0][index] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self):
+        for key, (counts, total, count) in self.values.items():
+            labels = dict(zip(self.label_names, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield (
+                    f'{self.name}_bucket',
+                    {**labels, 'le': _format_value(bound)},
+                    cumulative,
+                )
+            yield f'{self.name}_bucket', {**labels, 'le': '+Inf'}, count
+            yield f'{self.name}_sum', labels, total
+            yield f'{self.name}_count', labels, count
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+http_requests = registry.register(
+    Counter(
+        'http_requests_total',
+        'HTTP requests by route and status.',
+        ('method', 'route', 'status'),
+    )
+)
+http_errors = registry.register(
+    Counter(
+        'http_request_errors_total',
+        'HTTP requests that ended in a 5xx or an unhandled exception.',
+        ('method', 'route'),
+    )
+)
+http_latency = registry.register(
+    Histogram(
+        'http_request_duration_seconds',
+        'HTTP request latency by route.',
+        ('method', 'route'),
+    )
+)
+http_in_flight = registry.register(
+    Gauge('http_requests_in_flight', 'HTTP requests being served.')
+)
+hashing_latency = registry.register(
+    Histogram(
+        'password_hashing_duration_seconds',
+        'Time spent hashing or verifying passwords, including queueing.',
+        ('operation',),
+    )
+)
+
+
+async def metrics_middleware(request: Request, call_next):
+    http_in_flight.inc()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        http_in_flight.dec()
+        route = route_path(request)
+        http_latency.observe(
+            time.perf_counter() - start, method=request.method, route=route
+        )
+        http_requests.inc(method=request.method, route=route, status=status)
+        if status >= 500:  # noqa: PLR2004
+            http_errors.inc(method=request.method, route=route)
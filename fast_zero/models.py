@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import func
+from sqlalchemy import Index, func
 from sqlalchemy.orm import Mapped, mapped_column, registry
 
 table_registry = registry()
@@ -9,6 +9,7 @@ table_registry = registry()
 @table_registry.mapped_as_dataclass
 class User:
     __tablename__ = 'users'
+    __mapper_args__ = {'eager_defaults': True}
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     username: Mapped[str] = mapped_column(unique=True)
@@ -20,3 +21,16 @@ class User:
     updated_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now(), onupdate=func.now()
     )
+    last_login_at: Mapped[datetime | None] = mapped_column(
+        init=False, default=None
+    )
+    login_count: Mapped[int] = mapped_column(
+        init=False, default=0, server_default='0'
+    )
+    token_version: Mapped[int] = mapped_column(
+        init=False, default=0, server_default='0'
+    )
+
+
+Index('ix_users_email_lower', func.lower(User.email), unique=True)
+Index('ix_users_username_lower', func.lower(User.username), unique=True)
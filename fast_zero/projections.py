@@ -0,0 +1,100 @@
+from datetime import datetime
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from fast_zero.models import User
+from fast_zero.singleflight import SingleFlight
+
+user_row_lookups = SingleFlight('user_row')
+
+UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+class UserRow:
+    __slots__ = ('id', 'username', 'email')
+
+    def __init__(self, id: int, username: str, email: str):  # noqa: A002
+        self.id = id
+        self.username = username
+        self.email = email
+
+    def as_dict(self) -> dict:
+        return {'id': self.id, 'username': self.username, 'email': self.email}
+
+
+def select_user_rows():
+    return select(User.id, User.username, User.email)
+
+
+async def fetch_user_rows(session: AsyncSession, query) -> list[UserRow]:
+    result = await session.execute(query)
+    return [UserRow(*row) for row in result.tuples()]
+
+
+async def fetch_user_page(
+    session: AsyncSession, query
+) -> tuple[list[UserRow], datetime | None]:
+    result = await session.execute(query.add_columns(User.updated_at))
+    rows, last_modified = [], None
+    for id_, username, email, updated_at in result.tuples():
+        rows.append(UserRow(id_, username, email))
+        if last_modified is None or updated_at > last_modified:
+            last_modified = updated_at
+    return rows, last_modified
+
+
+async def fetch_user_row(session: AsyncSession, *criteria) -> UserRow | None:
+    result = await session.execute(select_user_rows().where(*criteria))
+    row = result.first()
+    return UserRow(*row) if row is not None else None
+
+
+async def fetch_user_row_coalesced(
+    session_factory: async_sessionmaker[AsyncSession],
+    key,
+    *criteria,
+    on_result=None,
+) -> UserRow | None:
+    """Run one lookup per `key` and share its row with every caller.
+
+    The lookup outlives whichever request started it, so it opens its own
+    session rather than borrowing the leader's. `on_result` runs before
+    the call is released, so callers arriving later find what it cached.
+    """
+
+    async def lookup():
+        async with session_factory() as session:
+            row = await fetch_user_row(session, *criteria)
+        if on_result is not None:
+            await on_result(row)
+        return row
+
+    return await user_row_lookups.do(key, lookup)
+
+
+def insert_user_row_statement(dialect_name: str):
+    dialect_insert = UPSERT_INSERTS.get(dialect_name)
+    if dialect_insert is None:
+        statement = insert(User)
+    else:
+        statement = dialect_insert(User).on_conflict_do_nothing()
+    return statement.returning(User.id, User.username, User.email)
+
+
+async def insert_user_row(session: AsyncSession, **values) -> UserRow | None:
+    """Insert a user in one statement; `None` if it hits a unique index.
+
+    Dialects without `ON CONFLICT` fall back to a plain insert and
+    surface the conflict as `IntegrityError`.
+    """
+    dialect_name = session.get_bind().dialect.name
+    result = await session.execute(
+        insert_user_row_statement(dialect_name), values
+    )
+    row = result.first()
+    return UserRow(*row) if row is not None else None
@@ -0,0 +1,85 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from http import HTTPStatus
+
+from fastapi import HTTPException
+
+from fast_zero.metrics import Counter, registry
+
+login_attempts_shed = registry.register(
+    Counter(
+        'login_attempts_shed_total',
+        'Login attempts rejected by the rate limiter before hashing.',
+        ('scope',),
+    )
+)
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window: float) -> float | None:
+        """Spend one token for `key`; return seconds to wait if none left."""
+
+    @abstractmethod
+    async def reset(self): ...
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: float) -> float | None:
+        now = time.monotonic()
+        rate = limit / window
+        tokens, updated_at = self._buckets.get(key, (limit, now))
+        tokens = min(limit, tokens + (now - updated_at) * rate)
+
+        retry_after = None
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+
+        return retry_after
+
+    async def reset(self):
+        self._buckets.clear()
+
+
+class LoginRateLimiter:
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        per_ip: int,
+        per_email: int,
+        window: float,
+    ):
+        self.backend = backend
+        self.per_ip = per_ip
+        self.per_email = per_email
+        self.window = window
+
+    async def check(self, client_ip: str, email: str):
+        limits = (
+            ('ip', client_ip, self.per_ip),
+            ('email', email.lower(), self.per_email),
+        )
+        for scope, value, limit in limits:
+            retry_after = await self.backend.hit(
+                f'login:{scope}:{value}', limit, self.window
+            )
+            if retry_after is not None:
+                login_attempts_shed.inc(scope=scope)
+                raise HTTPException(
+                    status_code=HTTPStatus.TOO_MANY_REQUESTS,
+                    detail='Too many login attempts, try again later',
+                    headers={'Retry-After': str(math.ceil(retry_after))},
+                )
@@ -0,0 +1,49 @@
+import hashlib
+import json
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, separators=(',', ':')
+    ).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:  # noqa: PLR6301
+        return dumps(content)
+
+
+def make_etag(body: bytes, weak=False) -> str:
+    digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def make_page_etag(ids, last_modified, *extra) -> str:
+    # Built from ids and the newest updated_at so it is known before the
+    # page is serialized; any edit, insert or delete in the page changes it.
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(','.join(map(str, ids)).encode())
+    for part in (last_modified, *extra):
+        digest.update(b'|' + str(part).encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag.removeprefix('W/')
+    return any(
+        candidate.strip().removeprefix('W/') == opaque
+        for candidate in if_none_match.split(',')
+    )
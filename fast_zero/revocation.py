@@ -0,0 +1,39 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fast_zero.cache import TTLCache
+from fast_zero.models import User
+
+
+class TokenVersions:
+    """Per-process cache of `users.token_version`.
+
+    The column is the source of truth, so every worker agrees on it and
+    it survives restarts; the cache only bounds how often it is read.
+    Another worker sees a bump within `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def current(self, session: AsyncSession, user_id: int):
+        version = self._cache.get(user_id)
+        if version is None:
+            version = await session.scalar(
+                select(User.token_version).where(User.id == user_id)
+            )
+            if version is not None:
+                self._cache.set(user_id, version)
+        return version
+
+    async def is_current(
+        self, session: AsyncSession, user_id: int, version
+    ) -> bool:
+        current = await self.current(session, user_id)
+        return current is not None and version == current
+
+    def forget(self, user_id: int):
+        self._cache.delete(user_id)
+
+    def clear(self):
+        self._cache.clear()
@@ -1,37 +1,45 @@
 from typing import Annotated
 
-from HTTP import HTTPStatus
-from fastapi import Depends, HTTPException, APIRouter
+from http import HTTPStatus
+from fastapi import Depends, HTTPException, APIRouter, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy import create_engine, select
+from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from fast_zero.database import get_session
-from fast_zero.fast_zero.schemas import Token
-from fast_zero.fast_zero.security import verify_password, create_access_token
+from fast_zero.schemas import Token
 from fast_zero.models import User
+from fast_zero.projections import UserRow
 from fast_zero.security import (
     create_access_token,
-    get_current_user,
-    verify_password,
+    get_current_user_row,
+    identity_claims,
+    login_limiter,
+    login_tracker,
+    verify_and_update_password_async,
 )
-from fast_zero.settings import Settings
-from fast_zero.tests.conftest import session
 
 router = APIRouter(prefix='/auth', tags=['auth'])
 
 Session = Annotated[AsyncSession, Depends(get_session)]
 OAuth2Form = Annotated[OAuth2PasswordRequestForm, Depends()]
 
-database = []
-engine = create_engine(Settings().DATABASE_URL)
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[UserRow, Depends(get_current_user_row)]
 
 
 @router.post('/token', response_model=Token)
-async def login_for_access_token(form_data: OAuth2Form, session: Session):
-    user = await session.scalar(select(User).where(User.email == form_data.email))
+async def login_for_access_token(
+    request: Request, form_data: OAuth2Form, session: Session
+):
+    client_ip = request.client.host if request.client else 'unknown'
+    await login_limiter.check(client_ip, form_data.username)
+
+    user = await session.scalar(
+        select(User).where(
+            func.lower(User.email) == form_data.username.lower()
+        )
+    )
 
     if not user:
         raise HTTPException(
@@ -40,18 +48,30 @@ async def login_for_access_token(form_data: OAuth2Form, session: Session):
             headers={'WWW-Authenticate': 'Bearer'},
         )
 
-    if not verify_password(form_data.password, user.password):
+    valid, updated_hash = await verify_and_update_password_async(
+        form_data.password, user.password
+    )
+    if not valid:
         raise HTTPException(
             status_code=HTTPStatus.UNAUTHORIZED,
             detail='Senha inválida.',
             headers={'WWW-Authenticate': 'Bearer'},
         )
-    access_token = create_access_token({'sub': user.email})
+
+    if updated_hash:
+        user.password = updated_hash
+        await session.commit()
+
+    await login_tracker.record(user.id)
+    access_token = create_access_token(await identity_claims(session, user))
     return {'access_token': access_token, 'token_type': 'Bearer'}
 
 
 @router.post('/refresh_token', response_model=Token)
-async def refresh_access_token(user: CurrentUser):
-    new_access_token = create_access_token(data={'sub': user.email})
+async def refresh_access_token(user: CurrentUser, session: Session):
+    await login_tracker.record(user.id)
+    new_access_token = create_access_token(
+        data=await identity_claims(session, user)
+    )
 
     return {'access_token': new_access_token, 'token_type': 'bearer'}
@@ -1,54 +1,286 @@
-from HTTP import HTTPStatus
-from typing import Annotated
+import binascii
+import csv
+import io
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from http import HTTPStatus
+from typing import Annotated, Literal
 
-from fastapi import Depends, HTTPException, APIRouter, Query
+from fastapi import Depends, HTTPException, APIRouter, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy import create_engine, select
+from sqlalchemy import func, insert, or_, select, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session
 
-from fast_zero.database import get_session
-from fast_zero.fast_zero.schemas import Message, UserSchema, UserPublic, UserList, FilterPage
-from fast_zero.fast_zero.security import get_password_hash, get_current_user
+from fast_zero.cache import MemoryCacheBackend, ResponseCache, TTLCache
+from fast_zero.database import (
+    get_session,
+    get_session_factory,
+    read_your_writes,
+)
+from fast_zero.schemas import Message, UserSchema, UserPublic, UserList, FilterPage
+from fast_zero.security import get_current_user
+from fast_zero.projections import (
+    UserRow,
+    fetch_user_page,
+    fetch_user_row,
+    fetch_user_row_coalesced,
+    insert_user_row,
+    select_user_rows,
+)
+from fast_zero.responses import (
+    FastJSONResponse,
+    dumps,
+    etag_matches,
+    make_etag,
+    make_page_etag,
+)
+from fast_zero.schemas import UserBulkCreate, UserBulkResult
+from fast_zero.security import (
+    forget_user,
+    get_current_user_row,
+    get_password_hash_async,
+    get_password_hashes_async,
+    revoke_tokens,
+)
 from fast_zero.models import User
-from fast_zero.settings import Settings
-from fast_zero.tests.conftest import session
+from fast_zero.settings import get_settings
 
 router = APIRouter(prefix='/users', tags=['users'])
+settings = get_settings()
+user_cache = ResponseCache(
+    'users',
+    MemoryCacheBackend(maxsize=settings.USER_CACHE_SIZE),
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+# Users written within the replica lag window: a replica read of them may
+# still be stale, so it must not be put back into `user_cache`.
+recent_writes = TTLCache(
+    maxsize=settings.USER_CACHE_SIZE, ttl=settings.READ_YOUR_WRITES_SECONDS
+)
 
 Session = Annotated[Session, Depends(get_session)]
 Current_user = Annotated[User, Depends(get_current_user)]
+Current_user_row = Annotated[UserRow, Depends(get_current_user_row)]
+SessionFactory = Annotated[
+    async_sessionmaker[AsyncSession], Depends(get_session_factory)
+]
+
+BULK_INSERT_CHUNK_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+EXPORT_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def _user_cache_key(user_id: int) -> str:
+    return f'user:{user_id}'
+
+
+async def _forget_cached_user(user_id: int):
+    forget_user(user_id)
+    recent_writes.set(user_id, True)
+    await user_cache.invalidate(_user_cache_key(user_id))
+
+
+def _encode_cursor(last_id: int) -> str:
+    return urlsafe_b64encode(str(last_id).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> int:
+    try:
+        return int(urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail='Cursor inválido.'
+        )
 
 
 @router.post('/', status_code=HTTPStatus.CREATED, response_model=UserPublic)
 async def create_user(user: UserSchema, session: Session):
+    conflict = HTTPException(
+        status_code=HTTPStatus.CONFLICT,
+        detail=(
+            f'Usuário com username {user.username} '
+            f'ou email {user.email} já existe.'
+        ),
+    )
 
-    db_user = await session.scalar(select(User).where(User.username == user.username | User.email == user.email))
-
-    if db_user:
-        if db_user.username == user.username or db_user.email == user.email:
-            raise HTTPException(
-                status_code=HTTPStatus.CONFLICT,
-                detail=f'Usuário com username {user.username} ou email {user.email} já existe.'
-            )
-    else:
-        db_user = User(
+    try:
+        db_user = await insert_user_row(
+            session,
             username=user.username,
             email=user.email,
-            password= get_password_hash(user.password),
+            password=await get_password_hash_async(user.password),
         )
+    except IntegrityError:
+        await session.rollback()
+        raise conflict
+
+    if db_user is None:
+        raise conflict
 
-    session.add(db_user)
     await session.commit()
-    await session.refresh(db_user)
 
     return db_user
 
 
-@router.get('/', status_code=HTTPStatus.OK, response_model=UserList)
-async def read_users(session: Session, current_user: Current_user, filter_users: Annotated[FilterPage, Query()]):
-    users = await session.scalars(select(User).limit(filter_users.limit).offset(filter_users.offset))
-    return {'users': users}
+@router.get(
+    '/',
+    status_code=HTTPStatus.OK,
+    response_model=UserList,
+    response_model_exclude_none=True,
+)
+async def read_users(
+    session: Session,
+    current_user: Current_user_row,
+    filter_users: Annotated[FilterPage, Query()],
+    request: Request,
+    response: Response,
+):
+    query = select_user_rows().order_by(User.id).limit(filter_users.limit)
+
+    if filter_users.cursor:
+        query = query.where(User.id > _decode_cursor(filter_users.cursor))
+    else:
+        query = query.offset(filter_users.offset)
+
+    users, last_modified = await fetch_user_page(session, query)
+
+    next_cursor = None
+    if filter_users.limit and len(users) == filter_users.limit:
+        next_cursor = _encode_cursor(users[-1].id)
+
+    headers = {
+        'ETag': make_page_etag(
+            [user.id for user in users], last_modified, next_cursor
+        ),
+        'Cache-Control': 'no-cache',
+    }
+    if etag_matches(request.headers.get('if-none-match'), headers['ETag']):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+    if settings.FAST_JSON_RESPONSES:
+        content = {'users': [user.as_dict() for user in users]}
+        if next_cursor:
+            content['next_cursor'] = next_cursor
+        return FastJSONResponse(content, headers=headers)
+
+    response.headers.update(headers)
+    return {'users': users, 'next_cursor': next_cursor}
+
+
+@router.post(
+    '/bulk', status_code=HTTPStatus.CREATED, response_model=UserBulkResult
+)
+async def create_users_bulk(
+    payload: UserBulkCreate, session: Session, current_user: Current_user_row
+):
+    usernames = {user.username.lower() for user in payload.users}
+    emails = {user.email.lower() for user in payload.users}
+    existing = await session.execute(
+        select(func.lower(User.username), func.lower(User.email)).where(
+            or_(
+                func.lower(User.username).in_(usernames),
+                func.lower(User.email).in_(emails),
+            )
+        )
+    )
+    taken_usernames, taken_emails = set(), set()
+    for username, email in existing:
+        taken_usernames.add(username)
+        taken_emails.add(email)
+
+    accepted, conflicts = [], []
+    for index, user in enumerate(payload.users):
+        username, email = user.username.lower(), user.email.lower()
+        if username in taken_usernames or email in taken_emails:
+            conflicts.append({
+                'index': index,
+                'username': user.username,
+                'email': user.email,
+                'detail': 'Username ou email já existe.',
+            })
+            continue
+
+        taken_usernames.add(username)
+        taken_emails.add(email)
+        accepted.append(user)
+
+    hashes = await get_password_hashes_async(
+        [user.password for user in accepted]
+    )
+    rows = [
+        {'username': user.username, 'email': user.email, 'password': hashed}
+        for user, hashed in zip(accepted, hashes)
+    ]
+
+    created = []
+    try:
+        for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+            result = await session.execute(
+                insert(User).returning(User.id, User.username, User.email),
+                rows[start : start + BULK_INSERT_CHUNK_SIZE],
+            )
+            created.extend(result.all())
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT,
+            detail='Username ou email já existe.'
+        )
+
+    return {'created': created, 'conflicts': conflicts}
+
+
+def _ndjson_batch(users) -> str:
+    return ''.join(
+        UserPublic.model_validate(user).model_dump_json() + '\n'
+        for user in users
+    )
+
+
+def _csv_batch(users) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows((user.id, user.username, user.email) for user in users)
+    return buffer.getvalue()
+
+
+async def _export_users(session_factory, export_format: str):
+    async with session_factory() as session:
+        users = await session.stream_scalars(
+            select(User)
+            .order_by(User.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+
+        if export_format == 'csv':
+            yield 'id,username,email\r\n'
+            write_batch = _csv_batch
+        else:
+            write_batch = _ndjson_batch
+
+        async for batch in users.partitions():
+            yield write_batch(batch)
+
+
+@router.get('/export', status_code=HTTPStatus.OK)
+async def export_users(
+    current_user: Current_user_row,
+    session_factory: SessionFactory,
+    export_format: Annotated[
+        Literal['ndjson', 'csv'], Query(alias='format')
+    ] = 'ndjson',
+):
+    return StreamingResponse(
+        _export_users(session_factory, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+    )
 
 
 @router.put('/{user_id}', status_code=HTTPStatus.OK, response_model=UserPublic)
@@ -59,16 +291,22 @@ async def update_user(user_id: int, user: UserSchema, session: Session, current_
             detail=f'Sem permissões suficientes.'
         )
 
+    statement = revoke_tokens(
+        update(User)
+        .where(User.id == user_id)
+        .values(
+            email=user.email,
+            username=user.username,
+            password=await get_password_hash_async(user.password),
+        )
+        .returning(User.id, User.username, User.email)
+    )
     try:
-        current_user.email = user.email
-        current_user.username = user.username
-        current_user.password = get_password_hash(user.password)
-
-        session.add(current_user)
+        result = await session.execute(statement)
         await session.commit()
-        await session.refresh(current_user)
+        await _forget_cached_user(user_id)
 
-        return current_user
+        return UserRow(*result.one()).as_dict()
     except IntegrityError:
         raise HTTPException(
             status_code=HTTPStatus.CONFLICT,
@@ -77,26 +315,62 @@ async def update_user(user_id: int, user: UserSchema, session: Session, current_
 
 
 @router.delete('/{user_id}', status_code=HTTPStatus.OK, response_model=Message)
-async def delete_user(user_id: int, session: Session):
-    user_db = session.scalar(select(User).where(User.id == user_id))
-    if not user_db:
+async def delete_user(
+    user_id: int, session: Session, current_user: Current_user
+):
+    if current_user.id != user_id:
         raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND,
-            detail=f'Usuário com id {user_id} não encontrado.'
+            status_code=HTTPStatus.FORBIDDEN,
+            detail='Sem permissões suficientes.',
         )
-    session.delete(user_db)
+
+    await session.delete(current_user)
     await session.commit()
+    await _forget_cached_user(user_id)
 
     return {'message': 'User deleted'}
 
 
 @router.get('/{user_id}', status_code=HTTPStatus.OK, response_model=UserPublic)
-async def read_user_by_id(user_id: int, session: Session):
-    user_db = await session.scalar(select(User).where(User.id == user_id))
-    if not user_db:
-        raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND,
-            detail=f'Usuário com id {user_id} não encontrado.'
-        )
+async def read_user_by_id(
+    user_id: int,
+    session: Session,
+    session_factory: SessionFactory,
+    request: Request,
+):
+    cache_key = _user_cache_key(user_id)
+    state = read_your_writes.get()
+    # Sticky requests follow a write and are routed to the primary, so
+    # they skip the shared cache and the coalesced (replica) lookup.
+    sticky = state is not None and state.sticky
+    body = None if sticky else await user_cache.get(cache_key)
+
+    async def cache_user(user_db: UserRow | None):
+        if user_db is not None and (
+            sticky or recent_writes.get(user_id) is None
+        ):
+            await user_cache.set(cache_key, dumps(user_db.as_dict()))
+
+    if body is None:
+        if sticky:
+            user_db = await fetch_user_row(session, User.id == user_id)
+            await cache_user(user_db)
+        else:
+            user_db = await fetch_user_row_coalesced(
+                session_factory,
+                ('id', user_id),
+                User.id == user_id,
+                on_result=cache_user,
+            )
+        if not user_db:
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_FOUND,
+                detail=f'Usuário com id {user_id} não encontrado.'
+            )
+        body = dumps(user_db.as_dict())
+
+    headers = {'ETag': make_etag(body), 'Cache-Control': 'no-cache'}
+    if etag_matches(request.headers.get('if-none-match'), headers['ETag']):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
 
-    return user_db
\ No newline at end of file
+    return Response(body, media_type='application/json', headers=headers)
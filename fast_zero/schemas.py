@@ -12,7 +12,9 @@ class UserPublic(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-class UserSchema(UserPublic):
+class UserSchema(BaseModel):
+    username: str
+    email: EmailStr
     password: str
 
 
@@ -20,8 +22,25 @@ class UserDB(UserSchema):
     id: int
 
 
+class UserBulkCreate(BaseModel):
+    users: list[UserSchema] = Field(min_length=1, max_length=5000)
+
+
+class UserConflict(BaseModel):
+    index: int
+    username: str
+    email: EmailStr
+    detail: str
+
+
+class UserBulkResult(BaseModel):
+    created: list[UserPublic]
+    conflicts: list[UserConflict]
+
+
 class UserList(BaseModel):
     users: list[UserPublic]
+    next_cursor: str | None = None
 
 
 class Token(BaseModel):
@@ -31,4 +50,5 @@ class Token(BaseModel):
 
 class FilterPage(BaseModel):
     limit: int = Field(ge=0, default=10)
-    offset: int = Field(ge=0, default=0)
\ No newline at end of file
+    offset: int = Field(ge=0, default=0)
+    cursor: str | None = None
@@ -1,24 +1,77 @@
+import time
 from datetime import datetime, timedelta
 from http import HTTPStatus
 from zoneinfo import ZoneInfo
 
-from fast_zero.database import get_session
+from fast_zero.cache import TTLCache
+from fast_zero.database import (
+    get_session,
+    get_session_factory,
+    use_primary,
+)
+from fast_zero.hashing import HashingExecutor
+from fast_zero.keys import KeyRing
+from fast_zero.metrics import CallbackGauge, registry
 from fast_zero.models import User
+from fast_zero.projections import UserRow, fetch_user_row_coalesced
+from fast_zero.ratelimit import LoginRateLimiter, MemoryRateLimitBackend
+from fast_zero.revocation import TokenVersions
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from jwt import DecodeError, ExpiredSignatureError, decode, encode
-from jwt import encode
+from jwt import InvalidTokenError
 from pwdlib import PasswordHash
-from pwdlib import PasswordHash
-from sqlalchemy import select
+from pwdlib.hashers.argon2 import Argon2Hasher
+from sqlalchemy import Update, func, select
 from sqlalchemy.orm import Session
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from fast_zero.settings import Settings
+from fast_zero.settings import get_settings
+from fast_zero.writebehind import LoginTracker
 
-pwd_context = PasswordHash.recommended()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='auth/token')
-settings = Settings()
+settings = get_settings()
+pwd_context = PasswordHash((
+    Argon2Hasher(
+        time_cost=settings.ARGON2_TIME_COST,
+        memory_cost=settings.ARGON2_MEMORY_COST,
+        parallelism=settings.ARGON2_PARALLELISM,
+    ),
+))
+key_ring = KeyRing.from_settings(settings)
+hashing_executor = HashingExecutor(
+    settings.HASHING_EXECUTOR,
+    max_workers=settings.HASHING_WORKERS,
+    max_pending=settings.HASHING_MAX_PENDING,
+)
+token_versions = TokenVersions(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.TOKEN_VERSION_TTL_SECONDS,
+)
+login_limiter = LoginRateLimiter(
+    MemoryRateLimitBackend(),
+    per_ip=settings.LOGIN_RATE_LIMIT_PER_IP,
+    per_email=settings.LOGIN_RATE_LIMIT_PER_EMAIL,
+    window=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+)
+login_tracker = LoginTracker(
+    flush_interval=settings.LOGIN_TRACKING_FLUSH_MS / 1000,
+    batch_size=settings.LOGIN_TRACKING_BATCH_SIZE,
+    max_pending=settings.LOGIN_TRACKING_MAX_PENDING,
+)
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL_SECONDS
+)
+registry.register(
+    CallbackGauge(
+        'token_cache',
+        'Verified token cache counters.',
+        lambda: [
+            ({'stat': stat}, value)
+            for stat, value in token_cache.stats().items()
+        ],
+        ('stat',),
+    )
+)
 
 
 def get_password_hash(password: str):
@@ -29,43 +82,149 @@ def verify_password(plain_password: str, hashed_password: str):
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str):
+    return await hashing_executor.run(get_password_hash, password)
+
+
+async def get_password_hashes_async(passwords: list[str]):
+    return await hashing_executor.map(get_password_hash, passwords)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str):
+    return await hashing_executor.run(
+        verify_password, plain_password, hashed_password
+    )
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+):
+    return await hashing_executor.run(
+        verify_and_update_password, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.now(tz=ZoneInfo('UTC')) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
 
-    encoded_jwt = encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = key_ring.sign(to_encode)
     return encoded_jwt
 
 
-async def get_current_user(
-    session: AsyncSession = Depends(get_session),
-    token: str = Depends(oauth2_scheme),
-):
-    credentials_exception = HTTPException(
+async def identity_claims(session: AsyncSession, user) -> dict:
+    claims = {'sub': user.email}
+    if settings.JWT_EMBED_IDENTITY:
+        claims.update(
+            uid=user.id,
+            username=user.username,
+            ver=await token_versions.current(session, user.id),
+        )
+    return claims
+
+
+def revoke_tokens(statement: Update) -> Update:
+    # Add the version bump to an UPDATE of users; call forget_user after
+    # the commit. Incremented in SQL so concurrent bumps from other workers
+    # (or from a stale copy of the row) cannot write back the same version.
+    return statement.values(token_version=User.token_version + 1)
+
+
+def forget_user(user_id: int):
+    token_versions.forget(user_id)
+    token_cache.discard_where(lambda user: user.id == user_id)
+
+
+def _credentials_exception():
+    return HTTPException(
         status_code=HTTPStatus.UNAUTHORIZED,
         detail='Could not validate credentials',
         headers={'WWW-Authenticate': 'Bearer'},
     )
 
+
+def _decode_token(token: str) -> dict:
     try:
-        payload = decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = key_ring.decode(token)
         subject_email = payload.get('sub')
 
         if not subject_email:
-            raise credentials_exception
+            raise _credentials_exception()
 
-    except DecodeError:
-        raise credentials_exception
+    except InvalidTokenError:
+        raise _credentials_exception()
 
-    except ExpiredSignatureError:
-        raise credentials_exception
+    return payload
 
-    user = await session.scalar(
-        select(User).where(User.email == subject_email)
+
+async def _check_token_version(session: AsyncSession, payload: dict):
+    if settings.JWT_EMBED_IDENTITY and 'uid' in payload:
+        if not await token_versions.is_current(
+            session, payload['uid'], payload.get('ver')
+        ):
+            raise _credentials_exception()
+
+
+async def get_current_user_row(
+    session: AsyncSession = Depends(get_session),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_session_factory
+    ),
+    token: str = Depends(oauth2_scheme),
+) -> UserRow:
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+
+    payload = _decode_token(token)
+
+    await _check_token_version(session, payload)
+    if settings.JWT_EMBED_IDENTITY and 'uid' in payload:
+        user = UserRow(payload['uid'], payload.get('username'), payload['sub'])
+        # Re-check the version as often as other workers' bumps can land.
+        recheck_at = time.time() + settings.TOKEN_VERSION_TTL_SECONDS
+        token_cache.set(
+            token, user, expires_at=min(payload['exp'], recheck_at)
+        )
+        return user
+
+    email = payload['sub'].lower()
+    user = await fetch_user_row_coalesced(
+        session_factory, ('email', email), func.lower(User.email) == email
     )
 
     if not user:
-        raise credentials_exception
+        raise _credentials_exception()
+
+    token_cache.set(token, user, expires_at=payload.get('exp'))
+
+    return user
+
+
+async def get_current_user(
+    session: AsyncSession = Depends(get_session),
+    token: str = Depends(oauth2_scheme),
+):
+    # The user is loaded to be changed, so read it where the write lands.
+    use_primary(session)
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        user = await session.get(User, cached_user.id)
+    else:
+        payload = _decode_token(token)
+        await _check_token_version(session, payload)
+        user = await session.scalar(
+            select(User).where(
+                func.lower(User.email) == payload['sub'].lower()
+            )
+        )
+
+    if not user:
+        raise _credentials_exception()
 
-    return user
\ No newline at end of file
+    return user
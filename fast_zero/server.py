@@ -0,0 +1,62 @@
+import argparse
+import importlib
+import os
+
+import uvicorn
+
+from fast_zero.settings import get_settings
+
+APP_FACTORY = 'fast_zero.app:create_app'
+
+
+def default_workers() -> int:
+    return os.process_cpu_count() or 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Run the API with multiple uvicorn worker processes.'
+    )
+    parser.add_argument('--host', default='0.0.0.0')  # noqa: S104
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument(
+        '--workers', type=int, help='Defaults to the available CPU count.'
+    )
+    parser.add_argument(
+        '--max-requests',
+        type=int,
+        default=10_000,
+        help='Recycle a worker after this many requests (0 disables).',
+    )
+    parser.add_argument(
+        '--graceful-timeout',
+        type=int,
+        default=30,
+        help='Seconds to drain in-flight requests on SIGTERM.',
+    )
+    args = parser.parse_args(argv)
+
+    # Set before settings are first read: with a single worker uvicorn
+    # runs the app in this process and reuses the cached settings.
+    os.environ.setdefault('WARM_ON_STARTUP', 'true')
+    get_settings.cache_clear()
+
+    # Import errors and bad configuration stop the launch here, once,
+    # instead of crash-looping every worker.
+    get_settings()
+    importlib.import_module(APP_FACTORY.split(':', 1)[0])
+
+    uvicorn.run(
+        APP_FACTORY,
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers or default_workers(),
+        limit_max_requests=args.max_requests or None,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        proxy_headers=True,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -7,7 +10,50 @@ class Settings(BaseSettings):
     )
 
     DATABASE_URL: str
+    DATABASE_READ_URL: str | None = None
+    READ_YOUR_WRITES_SECONDS: int = 5
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_PRE_PING: bool = False
+    DATABASE_POOL_RECYCLE: int = -1
+    DATABASE_POOL_TIMEOUT: float = 30
 
     SECRET_KEY: str
     ALGORITHM: str
-    ACCESS_TOKEN_EXPIRE_MINUTES: int
\ No newline at end of file
+    ACCESS_TOKEN_EXPIRE_MINUTES: int
+    JWT_KEYS_DIR: str | None = None
+    JWT_ACTIVE_KID: str | None = None
+    JWT_EMBED_IDENTITY: bool = False
+
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+
+    HASHING_EXECUTOR: Literal['process', 'thread', 'inline'] = 'process'
+    HASHING_WORKERS: int = 2
+    HASHING_MAX_PENDING: int = 64
+
+    TOKEN_CACHE_SIZE: int = 1024
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+    TOKEN_VERSION_TTL_SECONDS: int = 5
+
+    FAST_JSON_RESPONSES: bool = False
+    COMPRESSION_MIN_SIZE: int = 1024
+
+    USER_CACHE_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: int = 60
+
+    LOGIN_RATE_LIMIT_PER_IP: int = 20
+    LOGIN_RATE_LIMIT_PER_EMAIL: int = 5
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: int = 60
+
+    LOGIN_TRACKING_FLUSH_MS: int = 500
+    LOGIN_TRACKING_BATCH_SIZE: int = 1000
+    LOGIN_TRACKING_MAX_PENDING: int = 10_000
+
+    WARM_ON_STARTUP: bool = False
+
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
@@ -0,0 +1,34 @@
+import asyncio
+
+from fast_zero.metrics import Counter, registry
+
+singleflight_calls = registry.register(
+    Counter(
+        'singleflight_calls_total',
+        'Coalesced lookups by name and whether they ran or joined a call.',
+        ('name', 'result'),
+    )
+)
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._calls = {}
+
+    def _forget(self, key, future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+
+    async def do(self, key, func):
+        future = self._calls.get(key)
+
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+            singleflight_calls.inc(name=self.name, result='leader')
+        else:
+            singleflight_calls.inc(name=self.name, result='shared')
+
+        return await asyncio.shield(future)
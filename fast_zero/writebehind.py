@@ -0,0 +1,132 @@
+import asyncio
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from fast_zero.metrics import Counter, registry
+from fast_zero.models import User
+
+login_events = registry.register(
+    Counter(
+        'login_events_total',
+        'Login audit events by outcome of the write-behind flush.',
+        ('result',),
+    )
+)
+
+users = User.__table__
+
+# `updated_at` is pinned to itself so audit writes do not count as profile
+# changes (and do not invalidate the list ETags built from it).
+RECORD_LOGINS = (
+    update(users)
+    .where(users.c.id == bindparam('user_id'))
+    .values(
+        login_count=users.c.login_count + bindparam('logins'),
+        last_login_at=bindparam('logged_in_at'),
+        updated_at=users.c.updated_at,
+    )
+)
+
+
+class LoginTracker:
+    """Batch last-login/login-count updates off the request path.
+
+    Events are coalesced per user and flushed as one executemany UPDATE
+    every `flush_interval` seconds or after `batch_size` events. When
+    `max_pending` users are waiting, the caller flushes before queueing.
+    """
+
+    def __init__(
+        self, flush_interval: float, batch_size: int, max_pending: int
+    ):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.session_factory = None
+        self.pending: dict[int, list] = {}
+        self.events = 0
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._closing = False
+        self._task: asyncio.Task | None = None
+
+    async def record(self, user_id: int, at: datetime | None = None):
+        at = at or datetime.now(tz=ZoneInfo('UTC'))
+        if user_id not in self.pending and (
+            len(self.pending) >= self.max_pending
+        ):
+            await self.flush()
+
+        self._add(user_id, 1, at)
+        if self.events >= self.batch_size:
+            self._wake.set()
+
+    def _add(self, user_id: int, logins: int, at: datetime):
+        entry = self.pending.setdefault(user_id, [0, at])
+        entry[0] += logins
+        entry[1] = max(entry[1], at)
+        self.events += logins
+
+    async def flush(self) -> int:
+        async with self._lock:
+            if not self.pending:
+                return 0
+
+            batch, self.pending, self.events = self.pending, {}, 0
+            params = [
+                {'user_id': user_id, 'logins': logins, 'logged_in_at': at}
+                for user_id, (logins, at) in batch.items()
+            ]
+            count = sum(logins for logins, _ in batch.values())
+            if self.session_factory is None:
+                login_events.inc(count, result='dropped')
+                return 0
+
+            try:
+                async with self.session_factory() as session:
+                    await session.execute(RECORD_LOGINS, params)
+                    await session.commit()
+            except asyncio.CancelledError:
+                # Not written: requeue so the final flush still sees it.
+                for user_id, (logins, at) in batch.items():
+                    self._add(user_id, logins, at)
+                raise
+            except SQLAlchemyError:
+                login_events.inc(count, result='dropped')
+                return 0
+
+            login_events.inc(count, result='flushed')
+            return count
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(
+                    self._wake.wait(), timeout=self.flush_interval
+                )
+            except TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    def start(self, session_factory):
+        self.session_factory = session_factory
+        if self._task is None:
+            # Bind the primitives to the loop that runs the app.
+            self._lock = asyncio.Lock()
+            self._wake = asyncio.Event()
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            # Let the loop finish any flush in progress rather than
+            # cancelling it halfway through the UPDATE.
+            self._closing = True
+            self._wake.set()
+            await self._task
+            self._task = None
+        await self.flush()
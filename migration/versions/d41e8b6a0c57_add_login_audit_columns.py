@@ -0,0 +1,55 @@
+"""add login audit columns
+
+Revision ID: d41e8b6a0c57
+Revises: f2a9c4d7b813
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41e8b6a0c57'
+down_revision: Union[str, None] = 'f2a9c4d7b813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(
+            sa.Column('last_login_at', sa.DateTime(), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column(
+                'login_count',
+                sa.Integer(),
+                server_default='0',
+                nullable=False,
+            )
+        )
+
+
+def downgrade() -> None:
+    # On SQLite dropping a column rebuilds the table, and the rebuild cannot
+    # carry over the expression indexes (they are not reflected).
+    op.drop_index('ix_users_username_lower', table_name='users')
+    op.drop_index('ix_users_email_lower', table_name='users')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('login_count')
+        batch_op.drop_column('last_login_at')
+    op.create_index(
+        'ix_users_email_lower',
+        'users',
+        [sa.text('lower(email)')],
+        unique=True,
+    )
+    op.create_index(
+        'ix_users_username_lower',
+        'users',
+        [sa.text('lower(username)')],
+        unique=True,
+    )
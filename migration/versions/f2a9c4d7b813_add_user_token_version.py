@@ -0,0 +1,51 @@
+"""add user token version
+
+Revision ID: f2a9c4d7b813
+Revises: 9c7e5a3b1f20
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a9c4d7b813'
+down_revision: Union[str, None] = '9c7e5a3b1f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                'token_version',
+                sa.Integer(),
+                server_default='0',
+                nullable=False,
+            )
+        )
+
+
+def downgrade() -> None:
+    # On SQLite dropping a column rebuilds the table, and the rebuild cannot
+    # carry over the expression indexes (they are not reflected).
+    op.drop_index('ix_users_username_lower', table_name='users')
+    op.drop_index('ix_users_email_lower', table_name='users')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('token_version')
+    op.create_index(
+        'ix_users_email_lower',
+        'users',
+        [sa.text('lower(email)')],
+        unique=True,
+    )
+    op.create_index(
+        'ix_users_username_lower',
+        'users',
+        [sa.text('lower(username)')],
+        unique=True,
+    )
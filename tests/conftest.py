@@ -1,5 +1,6 @@
 import datetime
-from contextlib import contextmanager
+import os
+from contextlib import asynccontextmanager, contextmanager
 
 import pytest
 import factory
@@ -9,16 +10,49 @@ from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.pool import StaticPool
 
-from fast_zero.fast_zero.database import get_session
-from fast_zero.fast_zero.app import app
-from fast_zero.fast_zero.models import User, table_registry
+os.environ.setdefault('DATABASE_URL', 'sqlite+aiosqlite:///:memory:')
+os.environ.setdefault('SECRET_KEY', 'test-secret')
+os.environ.setdefault('ALGORITHM', 'HS256')
+os.environ.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+os.environ.setdefault('HASHING_EXECUTOR', 'inline')
+os.environ.setdefault('LOGIN_TRACKING_FLUSH_MS', '3600000')
+
+from fast_zero.database import get_session
+from fast_zero.database import get_session_factory
+from fast_zero.instrumentation import parse_query_count
+from fast_zero.app import app
+from fast_zero.models import User, table_registry
 from fast_zero.settings import Settings
-from fast_zero.fast_zero.security import get_password_hash
+from fast_zero.security import get_password_hash
+from fast_zero.cache import MemoryCacheBackend
+from fast_zero.routers.users import recent_writes, user_cache
+from fast_zero.ratelimit import MemoryRateLimitBackend
+from fast_zero.security import (
+    login_limiter,
+    login_tracker,
+    token_cache,
+    token_versions,
+)
 
 
-@pytest.fixture
-def client():
-    return TestClient(app)
+@pytest.fixture(autouse=True)
+def _clear_token_cache():
+    token_cache.clear()
+    token_versions.clear()
+    yield
+    token_cache.clear()
+    token_versions.clear()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_login_limiter():
+    login_limiter.backend = MemoryRateLimitBackend()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_user_cache():
+    user_cache.backend = MemoryCacheBackend(maxsize=100)
+    recent_writes.clear()
 
 
 @pytest_asyncio.fixture
@@ -60,30 +94,62 @@ def mock_db_time():
     return _mock_db_time
 
 
+@contextmanager
+def _count_queries(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(
+        engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+    )
+
+    yield statements
+
+    event.remove(
+        engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+    )
+
+
+@pytest.fixture
+def count_queries(session):
+    return lambda: _count_queries(session.bind)
+
+
+def _assert_query_budget(response, budget: int):
+    queries = parse_query_count(response.headers['Server-Timing'])
+    assert queries <= budget, (
+        f'{response.request.method} {response.request.url.path} '
+        f'issued {queries} queries, budget is {budget}'
+    )
+
+
+@pytest.fixture
+def assert_query_budget():
+    return _assert_query_budget
+
+
 @pytest_asyncio.fixture
 async def client(session: AsyncSession):
     def get_session_override():
         return session
 
+    @asynccontextmanager
+    async def session_factory_override():
+        yield session
+
     with TestClient(app) as client:
         app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_session_factory] = (
+            lambda: session_factory_override
+        )
+        login_tracker.session_factory = session_factory_override
+        yield client
 
     app.dependency_overrides.clear()
 
 
-@pytest_asyncio.fixture
-async def user(session: AsyncSession):
-    password = 'testtest'
-    user = User(username='Teste', email='teste@test.com', password=password)
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-
-    user.clean_password = password
-
-    return user
-
-
 @pytest.fixture
 def token(client, user):
     response = client.post(
@@ -91,7 +157,8 @@ def token(client, user):
         data={'username': user.email, 'password': user.clean_password}
     )
 
-    return response.json()['token']
+    return response.json()['access_token']
+
 
 @pytest.fixture
 def settings(session):
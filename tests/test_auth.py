@@ -1,14 +1,20 @@
 from http import HTTPStatus
 
-from fast_zero.fast_zero.schemas import UserPublic
+import pytest
+
+from fast_zero.schemas import UserPublic
 from freezegun import freeze_time
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+from fast_zero.security import verify_password
 
 
 def test_get_token(client, user):
     response = client.post(
         '/auth/token',
         data={'username': user.email,
-              'password': user.clear_password}
+              'password': user.clean_password}
     )
     token = response.json()
 
@@ -17,6 +23,17 @@ def test_get_token(client, user):
     assert 'access_token' in token
 
 
+def test_get_token_email_case_insensitive(client, user):
+    response = client.post(
+        '/auth/token',
+        data={'username': user.email.upper(),
+              'password': user.clean_password}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert 'access_token' in response.json()
+
+
 def test_token_expired_after_time(client, user):
     with freeze_time('2023-07-14 12:00:00'):
         response = client.post(
@@ -46,7 +63,7 @@ def test_token_inexistent_user(client):
         data={'username': 'no_user@no_domain.com', 'password': 'testtest'},
     )
     assert response.status_code == HTTPStatus.UNAUTHORIZED
-    assert response.json() == {'detail': 'Incorrect email or password'}
+    assert response.json() == {'detail': 'Email ou senha inválidos.'}
 
 
 def test_token_wrong_password(client, user):
@@ -55,7 +72,7 @@ def test_token_wrong_password(client, user):
         data={'username': user.email, 'password': 'wrong_password'}
     )
     assert response.status_code == HTTPStatus.UNAUTHORIZED
-    assert response.json() == {'detail': 'Incorrect email or password'}
+    assert response.json() == {'detail': 'Senha inválida.'}
 
 
 def test_refresh_token(client, token):
@@ -88,3 +105,22 @@ def test_token_expired_dont_refresh(client, user):
         )
         assert response.status_code == HTTPStatus.UNAUTHORIZED
         assert response.json() == {'detail': 'Could not validate credentials'}
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_password(client, session, user):
+    weak_hasher = PasswordHash((
+        Argon2Hasher(time_cost=1, memory_cost=8, parallelism=1),
+    ))
+    outdated_hash = weak_hasher.hash(user.clean_password)
+    user.password = outdated_hash
+    await session.commit()
+
+    response = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert user.password != outdated_hash
+    assert verify_password(user.clean_password, user.password)
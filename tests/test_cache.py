@@ -0,0 +1,146 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from freezegun import freeze_time
+
+from fast_zero.cache import CacheBackend, MemoryCacheBackend, TTLCache
+from fast_zero.database import PRIMARY_COOKIE
+from fast_zero.routers.users import user_cache
+
+
+def test_cache_hit_and_miss_are_counted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 2}
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3  # noqa: PLR2004
+
+
+def test_cache_honours_explicit_expiry():
+    cache = TTLCache(maxsize=2, ttl=600)
+
+    with freeze_time('2024-01-01 12:00:00') as frozen:
+        cache.set('token', 'user', expires_at=frozen().timestamp() + 30)
+        frozen.tick(31)
+
+        assert cache.get('token') is None
+
+
+def test_cache_discard_where():
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+
+    cache.discard_where(lambda value: value == 1)
+
+    assert cache.get('a') is None
+    assert cache.get('b') == 2  # noqa: PLR2004
+
+
+class FakeExternalBackend(CacheBackend):
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ttl):
+        self.store[key] = value
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+
+    async def clear(self):
+        self.store.clear()
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_expires_entries():
+    backend = MemoryCacheBackend(maxsize=2)
+
+    with freeze_time('2024-01-01 12:00:00') as frozen:
+        await backend.set('key', b'value', ttl=10)
+        assert await backend.get('key') == b'value'
+        frozen.tick(11)
+        assert await backend.get('key') is None
+
+
+def test_read_user_by_id_is_served_from_cache(client, user, count_queries):
+    user_cache.backend = FakeExternalBackend()
+    client.get(f'/users/{user.id}')
+
+    with count_queries() as statements:
+        response = client.get(f'/users/{user.id}')
+
+    assert response.status_code == HTTPStatus.OK
+    assert statements == []
+    assert f'user:{user.id}' in user_cache.backend.store
+
+
+def test_read_user_by_id_not_modified(client, user):
+    etag = client.get(f'/users/{user.id}').headers['ETag']
+
+    response = client.get(f'/users/{user.id}', headers={'If-None-Match': etag})
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers['ETag'] == etag
+    assert response.content == b''
+
+
+def test_update_user_invalidates_cached_profile(client, user, token):
+    client.get(f'/users/{user.id}')
+    client.put(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'username': 'Bob',
+            'email': 'bob@example.com',
+            'password': 'secret',
+        },
+    )
+
+    response = client.get(f'/users/{user.id}')
+
+    assert response.json()['username'] == 'Bob'
+
+
+def test_read_after_write_does_not_refill_cache(client, user, token):
+    user_cache.backend = FakeExternalBackend()
+    client.put(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'username': 'Bob',
+            'email': 'bob@example.com',
+            'password': 'secret',
+        },
+    )
+
+    client.get(f'/users/{user.id}')
+
+    assert f'user:{user.id}' not in user_cache.backend.store
+
+
+def test_sticky_read_bypasses_stale_cache(client, user):
+    user_cache.backend = FakeExternalBackend()
+    user_cache.backend.store[f'user:{user.id}'] = b'{"stale":true}'
+    client.cookies.set(PRIMARY_COOKIE, str(int(time.time()) + 60))
+
+    response = client.get(f'/users/{user.id}')
+
+    assert response.json()['username'] == user.username
+    assert b'stale' not in user_cache.backend.store[f'user:{user.id}']
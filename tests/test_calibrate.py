@@ -0,0 +1,21 @@
+from fast_zero import calibrate
+
+
+def test_calibrate_stops_at_first_cost_over_target(monkeypatch):
+    timings = {1: 40.0, 2: 90.0, 3: 130.0, 4: 180.0}
+    monkeypatch.setattr(
+        calibrate,
+        'measure_ms',
+        lambda time_cost, memory_cost, parallelism: timings[time_cost],
+    )
+
+    result = calibrate.calibrate(
+        target_ms=120, memory_cost=1024, parallelism=1
+    )
+
+    assert result == {
+        'ARGON2_TIME_COST': 3,
+        'ARGON2_MEMORY_COST': 1024,
+        'ARGON2_PARALLELISM': 1,
+        'measured_ms': 130.0,
+    }
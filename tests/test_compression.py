@@ -0,0 +1,25 @@
+from fast_zero.compression import choose_encoding
+
+
+def test_choose_encoding_prefers_gzip_over_identity():
+    assert choose_encoding('identity, gzip') == 'gzip'
+
+
+def test_choose_encoding_respects_zero_quality():
+    assert choose_encoding('gzip;q=0') is None
+    assert choose_encoding(None) is None
+
+
+def test_large_response_is_compressed(client):
+    response = client.get('/metrics', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert 'http_requests_total' in response.text
+
+
+def test_small_response_is_not_compressed(client):
+    response = client.get('/', headers={'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in response.headers
+    assert response.json() == {'message': 'Olá Mundo!'}
@@ -1,8 +1,26 @@
 from dataclasses import asdict
+from http import HTTPStatus
 
 import pytest
-from fast_zero.models import User
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from fast_zero.app import app, create_app
+from fast_zero.database import (
+    InstrumentedPool,
+    ReadYourWrites,
+    database,
+    engine_options,
+    get_session,
+    pool_stats,
+    read_your_writes,
+    session_options,
+    use_primary,
+)
+from fast_zero.models import User, table_registry
+from fast_zero.security import create_access_token
+from fast_zero.settings import get_settings
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 
 @pytest.mark.asyncio
@@ -14,7 +32,7 @@ async  def test_create_user(session, mock_db_time):
         session.add(new_user)
         await session.commit()
 
-    user = await session.scalar(select(User).where(User.username == 'test'))
+    user = await session.scalar(select(User).where(User.username == 'alice'))
 
     assert asdict(user) == {
         'id': 1,
@@ -22,4 +40,155 @@ async  def test_create_user(session, mock_db_time):
         'password': 'secret',
         'email': 'teste@test',
         'created_at': time,
+        'updated_at': time,
+        'last_login_at': None,
+        'login_count': 0,
+        'token_version': 0,
     }
+
+
+def test_engine_options_skip_pool_for_in_memory_sqlite(settings):
+    memory = settings.model_copy(
+        update={'DATABASE_URL': 'sqlite+aiosqlite:///:memory:'}
+    )
+
+    assert engine_options(memory) == {}
+
+
+def test_engine_options_use_pool_settings(settings):
+    postgres = settings.model_copy(
+        update={
+            'DATABASE_URL': 'postgresql+psycopg://app@localhost/app',
+            'DATABASE_POOL_SIZE': 20,
+            'DATABASE_MAX_OVERFLOW': 5,
+        }
+    )
+
+    options = engine_options(postgres)
+
+    assert options['poolclass'] is InstrumentedPool
+    assert options['pool_size'] == 20  # noqa: PLR2004
+    assert options['max_overflow'] == 5  # noqa: PLR2004
+
+
+def test_pool_stats_reports_waits():
+    assert {
+        'checkouts',
+        'wait_seconds_total',
+        'wait_seconds_max',
+    } <= pool_stats().keys()
+
+
+@pytest_asyncio.fixture
+async def primary_and_replica(tmp_path):
+    engines = [
+        create_async_engine(f'sqlite+aiosqlite:///{tmp_path / name}.db')
+        for name in ('primary', 'replica')
+    ]
+    for engine in engines:
+        async with engine.begin() as conn:
+            await conn.run_sync(table_registry.metadata.create_all)
+
+    yield engines
+
+    for engine in engines:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_routing_session_writes_primary_reads_replica(
+    primary_and_replica,
+):
+    primary, replica = primary_and_replica
+    options = session_options(primary, replica)
+
+    async with AsyncSession(**options) as session:
+        session.add(User(username='alice', password='x', email='a@a.com'))
+        await session.commit()
+
+        assert await session.scalar(select(User.username)) == 'alice'
+
+    async with AsyncSession(**options) as session:
+        assert await session.scalar(select(User.username)) is None
+
+    async with AsyncSession(primary) as session:
+        assert await session.scalar(select(User.username)) == 'alice'
+
+
+@pytest.mark.asyncio
+async def test_routing_session_sticks_to_primary_after_write(
+    primary_and_replica,
+):
+    primary, replica = primary_and_replica
+    async with AsyncSession(primary) as session:
+        session.add(User(username='alice', password='x', email='a@a.com'))
+        await session.commit()
+
+    token = read_your_writes.set(ReadYourWrites(sticky=True))
+    try:
+        options = session_options(primary, replica)
+        async with AsyncSession(**options) as session:
+            assert await session.scalar(select(User.username)) == 'alice'
+    finally:
+        read_your_writes.reset(token)
+
+
+def test_get_settings_is_cached():
+    assert get_settings() is get_settings()
+
+
+@pytest.mark.asyncio
+async def test_lifespan_creates_and_disposes_engine():
+    app = create_app()
+
+    async with app.router.lifespan_context(app):
+        assert database.engine is not None
+        assert database.session_factory is not None
+
+    assert database.engine is None
+
+
+@pytest.mark.asyncio
+async def test_use_primary_routes_reads_to_primary(primary_and_replica):
+    primary, replica = primary_and_replica
+    async with AsyncSession(primary) as session:
+        session.add(User(username='alice', password='x', email='a@a.com'))
+        await session.commit()
+
+    async with AsyncSession(**session_options(primary, replica)) as session:
+        use_primary(session)
+
+        assert await session.scalar(select(User.username)) == 'alice'
+
+
+@pytest.mark.asyncio
+async def test_update_reads_current_user_from_primary(primary_and_replica):
+    primary, replica = primary_and_replica
+    async with AsyncSession(primary) as session:
+        user = User(username='alice', password='x', email='a@a.com')
+        session.add(user)
+        await session.flush()
+        user_id = user.id
+        await session.commit()
+
+    async def get_session_override():
+        async with AsyncSession(**session_options(primary, replica)) as s:
+            yield s
+
+    app.dependency_overrides[get_session] = get_session_override
+    token = create_access_token({'sub': 'a@a.com'})
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as ac:
+        response = await ac.put(
+            f'/users/{user_id}',
+            headers={'Authorization': f'Bearer {token}'},
+            json={
+                'username': 'bob',
+                'email': 'b@b.com',
+                'password': 'secret',
+            },
+        )
+    app.dependency_overrides.clear()
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['username'] == 'bob'
@@ -0,0 +1,82 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+
+from fast_zero.hashing import HashingExecutor
+
+
+def double(value):
+    return value * 2
+
+
+@pytest.mark.asyncio
+async def test_inline_executor_runs_in_place():
+    executor = HashingExecutor('inline', max_workers=1, max_pending=0)
+
+    assert await executor.run(double, 21) == 42  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_thread_executor_runs_function():
+    executor = HashingExecutor('thread', max_workers=2, max_pending=4)
+
+    results = await asyncio.gather(
+        *(executor.run(double, n) for n in range(4))
+    )
+
+    assert results == [0, 2, 4, 6]
+    assert executor.pending == 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_saturated_returns_503():
+    executor = HashingExecutor('thread', max_workers=1, max_pending=1)
+    executor.pending = 1
+
+    with pytest.raises(HTTPException) as exc_info:
+        await executor.run(double, 1)
+
+    assert exc_info.value.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert exc_info.value.headers == {'Retry-After': '1'}
+
+
+@pytest.mark.asyncio
+async def test_executor_map_hashes_in_windows_that_fit():
+    executor = HashingExecutor('thread', max_workers=2, max_pending=3)
+    executor.pending = 2
+    peak = []
+
+    def record(value):
+        peak.append(executor.pending)
+        return double(value)
+
+    assert await executor.map(record, [1, 2, 3, 4]) == [2, 4, 6, 8]
+    assert max(peak) == 3  # noqa: PLR2004
+    assert executor.pending == 2  # noqa: PLR2004
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_map_rejects_when_executor_is_full():
+    executor = HashingExecutor('thread', max_workers=2, max_pending=4)
+    executor.pending = 4
+
+    with pytest.raises(HTTPException) as exc_info:
+        await executor.map(double, [1, 2, 3])
+
+    assert exc_info.value.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert executor.pending == 4  # noqa: PLR2004
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_warm_starts_the_executor():
+    executor = HashingExecutor('thread', max_workers=2, max_pending=4)
+
+    await executor.warm()
+
+    assert executor._executor is not None
+    executor.shutdown()
@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from fast_zero.instrumentation import (
+    QueryReport,
+    QueryStats,
+    current_query_stats,
+    parse_query_count,
+)
+
+
+def test_query_stats_server_timing():
+    stats = QueryStats()
+    stats.record('SELECT 1', 0.002)
+    stats.record('SELECT 2', 0.001)
+
+    assert stats.server_timing() == (
+        'db;dur=3.00;desc="2 queries", db-slowest;dur=2.00'
+    )
+    assert stats.slowest_statement == 'SELECT 1'
+    assert parse_query_count(stats.server_timing()) == 2  # noqa: PLR2004
+
+
+def test_parse_query_count_without_header_value():
+    with pytest.raises(ValueError, match='No query count'):
+        parse_query_count('cache;desc="hit"')
+
+
+def test_query_report_aggregates_per_route():
+    report = QueryReport()
+    for count in (1, 3):
+        stats = QueryStats()
+        for _ in range(count):
+            stats.record('SELECT 1', 0.001)
+        report.add('GET /users/', stats)
+
+    entry = report.snapshot()['GET /users/']
+
+    assert entry['requests'] == 2  # noqa: PLR2004
+    assert entry['queries'] == 4  # noqa: PLR2004
+    assert entry['max_queries'] == 3  # noqa: PLR2004
+
+
+def test_read_user_by_id_query_budget(client, user, assert_query_budget):
+    response = client.get(f'/users/{user.id}')
+
+    assert_query_budget(response, 1)
+
+
+def test_failed_statement_does_not_leak_start_time():
+    engine = create_engine('sqlite://')
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        with engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    conn.execute(text('SELECT * FROM missing'))
+            conn.execute(text('SELECT 1'))
+
+            assert conn.info['query_started_at'] == []
+    finally:
+        current_query_stats.reset(token)
+        engine.dispose()
+
+    assert stats.count == 4  # noqa: PLR2004
@@ -0,0 +1,114 @@
+from base64 import urlsafe_b64encode
+from http import HTTPStatus
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from jwt import DecodeError, InvalidTokenError
+
+from fast_zero import security
+from fast_zero.keys import KeyRing, generate_private_key
+
+
+@pytest.mark.parametrize('algorithm', ['EdDSA', 'ES256'])
+def test_key_ring_signs_with_active_kid(algorithm):
+    key_ring = KeyRing(
+        algorithm, private_keys={'k1': generate_private_key(algorithm)}
+    )
+
+    token = key_ring.sign({'sub': 'alice@example.com'})
+
+    assert key_ring.decode(token) == {'sub': 'alice@example.com'}
+
+
+def test_key_ring_verifies_tokens_from_retired_key():
+    old_key = generate_private_key('EdDSA')
+    old_ring = KeyRing('EdDSA', private_keys={'2024-01': old_key})
+    new_ring = KeyRing(
+        'EdDSA',
+        private_keys={'2024-06': generate_private_key('EdDSA')},
+        public_keys={'2024-01': old_key.public_key()},
+    )
+
+    token = old_ring.sign({'sub': 'alice@example.com'})
+
+    assert new_ring.active_kid == '2024-06'
+    assert new_ring.decode(token)['sub'] == 'alice@example.com'
+
+
+def test_key_ring_rejects_unknown_kid():
+    signer = KeyRing(
+        'EdDSA', private_keys={'a': generate_private_key('EdDSA')}
+    )
+    verifier = KeyRing(
+        'EdDSA', private_keys={'b': generate_private_key('EdDSA')}
+    )
+
+    with pytest.raises(DecodeError, match='Unknown key id'):
+        verifier.decode(signer.sign({'sub': 'alice@example.com'}))
+
+
+def test_key_ring_rejects_unhashable_kid():
+    ring = KeyRing('EdDSA', private_keys={'k1': generate_private_key('EdDSA')})
+    header = urlsafe_b64encode(b'{"alg":"EdDSA","kid":["k1"]}').rstrip(b'=')
+    token = f'{header.decode()}.e30.c2ln'
+
+    with pytest.raises(InvalidTokenError):
+        ring.decode(token)
+
+
+def test_hs256_token_after_switch_to_eddsa_is_unauthorized(
+    client, user, monkeypatch
+):
+    token = jwt.encode(
+        {'sub': user.email}, 'old-secret', headers={'kid': 'k1'}
+    )
+    monkeypatch.setattr(
+        security,
+        'key_ring',
+        KeyRing('EdDSA', private_keys={'k1': generate_private_key('EdDSA')}),
+    )
+
+    response = client.post(
+        '/auth/refresh_token', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_key_ring_from_settings_reads_keys_dir(settings, tmp_path):
+    key = generate_private_key('ES256')
+    (tmp_path / 'k1.pem').write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    (tmp_path / 'k0.pub.pem').write_bytes(
+        generate_private_key('ES256')
+        .public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+
+    key_ring = KeyRing.from_settings(
+        settings.model_copy(
+            update={'ALGORITHM': 'ES256', 'JWT_KEYS_DIR': str(tmp_path)}
+        )
+    )
+
+    assert key_ring.active_kid == 'k1'
+    assert sorted(jwk['kid'] for jwk in key_ring.jwks()['keys']) == [
+        'k0',
+        'k1',
+    ]
+
+
+def test_jwks_endpoint_is_empty_for_shared_secret(client):
+    response = client.get('/.well-known/jwks.json')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'keys': []}
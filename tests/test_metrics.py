@@ -0,0 +1,55 @@
+from http import HTTPStatus
+
+from fast_zero.metrics import CallbackGauge, Counter, Histogram, Registry
+
+
+def test_counter_renders_labels():
+    counter = Counter('requests_total', 'Requests.', ('route',))
+    counter.inc(route='/users/')
+    counter.inc(route='/users/')
+
+    assert counter.render() == [
+        '# HELP requests_total Requests.',
+        '# TYPE requests_total counter',
+        'requests_total{route="/users/"} 2',
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram('latency', 'Latency.', buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5.0)
+
+    assert histogram.render()[2:] == [
+        'latency_bucket{le="0.1"} 1',
+        'latency_bucket{le="1.0"} 2',
+        'latency_bucket{le="+Inf"} 3',
+        'latency_sum 5.55',
+        'latency_count 3',
+    ]
+
+
+def test_registry_renders_callback_gauge():
+    registry = Registry()
+    registry.register(
+        CallbackGauge('pool', 'Pool.', lambda: [({'state': 'idle'}, 3)])
+    )
+
+    assert registry.render() == (
+        '# HELP pool Pool.\n# TYPE pool gauge\npool{state="idle"} 3\n'
+    )
+
+
+def test_metrics_endpoint(client):
+    client.get('/')
+
+    response = client.get('/metrics')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/plain')
+    assert (
+        'http_requests_total{method="GET",route="/",status="200"}'
+        in response.text
+    )
+    assert 'db_pool_checkouts' in response.text
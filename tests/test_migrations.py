@@ -0,0 +1,43 @@
+import sqlite3
+
+import pytest
+from alembic import command
+from alembic.config import Config
+
+from fast_zero.settings import get_settings
+
+
+@pytest.fixture
+def alembic_config(monkeypatch, tmp_path):
+    path = tmp_path / 'migrations.db'
+    monkeypatch.setenv('DATABASE_URL', f'sqlite+aiosqlite:///{path}')
+    get_settings.cache_clear()
+    yield Config('alembic.ini'), path
+    get_settings.cache_clear()
+
+
+def _schema(path) -> set[str]:
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute(
+            "SELECT name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'"
+        )
+        return {name for (name,) in rows}
+
+
+def test_upgrade_check_and_downgrade(alembic_config):
+    config, path = alembic_config
+
+    command.upgrade(config, 'head')
+    assert _schema(path) == {
+        'alembic_version',
+        'users',
+        'ix_users_email_lower',
+        'ix_users_username_lower',
+    }
+    command.check(config)
+
+    command.downgrade(config, '9c7e5a3b1f20')
+    assert 'ix_users_username_lower' in _schema(path)
+
+    command.downgrade(config, 'base')
+    assert _schema(path) == {'alembic_version'}
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from fast_zero.models import User, table_registry
+from fast_zero.projections import (
+    UserRow,
+    fetch_user_row,
+    fetch_user_rows,
+    insert_user_row,
+    select_user_rows,
+)
+
+
+def test_user_row_has_no_instance_dict():
+    row = UserRow(1, 'alice', 'alice@example.com')
+
+    assert not hasattr(row, '__dict__')
+    assert row.as_dict() == {
+        'id': 1,
+        'username': 'alice',
+        'email': 'alice@example.com',
+    }
+
+
+@pytest.mark.asyncio
+async def test_fetch_user_row(session, user):
+    row = await fetch_user_row(session, User.id == user.id)
+
+    assert row.as_dict() == {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+    }
+
+
+@pytest.mark.asyncio
+async def test_fetch_user_row_not_found(session):
+    assert await fetch_user_row(session, User.id == 999) is None  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_fetch_user_rows_selects_only_public_columns(
+    session, user, other_user, count_queries
+):
+    with count_queries() as statements:
+        rows = await fetch_user_rows(
+            session, select_user_rows().order_by(User.id)
+        )
+
+    assert [row.id for row in rows] == [user.id, other_user.id]
+    assert 'password' not in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_insert_user_row_conflict_returns_none(session, user):
+    row = await insert_user_row(
+        session,
+        username='someone',
+        email=user.email.upper(),
+        password='secret',
+    )
+
+    assert row is None
+
+
+@pytest.mark.asyncio
+async def test_insert_user_row_parallel_signups_same_email(tmp_path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path}/race.db')
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.create_all)
+
+    async def signup(n: int):
+        async with AsyncSession(engine) as session:
+            row = await insert_user_row(
+                session,
+                username=f'user{n}',
+                email='race@example.com',
+                password='secret',
+            )
+            await session.commit()
+            return row
+
+    rows = await asyncio.gather(*(signup(n) for n in range(10)))
+
+    async with AsyncSession(engine) as session:
+        total = await session.scalar(select(func.count(User.id)))
+    await engine.dispose()
+
+    assert len([row for row in rows if row is not None]) == 1
+    assert total == 1
@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from freezegun import freeze_time
+
+from fast_zero.ratelimit import MemoryRateLimitBackend, RateLimitBackend
+from fast_zero.security import login_limiter
+
+
+class FakeSharedBackend(RateLimitBackend):
+    def __init__(self):
+        self.hits = []
+
+    async def hit(self, key, limit, window):
+        self.hits.append(key)
+        return 30.0 if key.startswith('login:email:') else None
+
+    async def reset(self):
+        self.hits.clear()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills_over_time():
+    backend = MemoryRateLimitBackend()
+
+    with freeze_time('2024-01-01 12:00:00') as frozen:
+        assert await backend.hit('key', limit=2, window=60) is None
+        assert await backend.hit('key', limit=2, window=60) is None
+        retry_after = await backend.hit('key', limit=2, window=60)
+        assert retry_after == 30.0  # noqa: PLR2004
+
+        frozen.tick(30)
+
+        assert await backend.hit('key', limit=2, window=60) is None
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_is_bounded():
+    backend = MemoryRateLimitBackend(maxsize=2)
+
+    for key in ('a', 'b', 'c'):
+        await backend.hit(key, limit=1, window=60)
+
+    assert list(backend._buckets) == ['b', 'c']
+
+
+def test_login_is_rejected_before_password_check(client, user, monkeypatch):
+    monkeypatch.setattr(login_limiter, 'per_email', 1)
+    data = {'username': user.email, 'password': 'wrong'}
+
+    first = client.post('/auth/token', data=data)
+    second = client.post('/auth/token', data=data)
+
+    assert first.status_code == HTTPStatus.UNAUTHORIZED
+    assert second.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert int(second.headers['Retry-After']) > 0
+
+
+def test_login_limiter_uses_pluggable_backend(client, user):
+    login_limiter.backend = FakeSharedBackend()
+
+    response = client.post(
+        '/auth/token',
+        data={'username': user.email.upper(), 'password': 'testtest'},
+    )
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert response.headers['Retry-After'] == '30'
+    assert login_limiter.backend.hits == [
+        'login:ip:testclient',
+        f'login:email:{user.email}',
+    ]
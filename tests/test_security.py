@@ -1,7 +1,14 @@
 from jwt import decode
 from http import HTTPStatus
 
-from fast_zero.fast_zero.security import create_access_token
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fast_zero.models import User
+from fast_zero.security import create_access_token, revoke_tokens
+from fast_zero import security
+from fast_zero.security import token_cache
 
 
 def test_jwt(settings):
@@ -39,3 +46,149 @@ def test_get_current_user_does_not_exists(client):
 
     assert response.status_code == HTTPStatus.UNAUTHORIZED
     assert response.json() == {'detail': 'Could not validate credentials'}
+
+
+def test_get_current_user_reuses_cached_token(client, token):
+    for _ in range(2):
+        response = client.post(
+            '/auth/refresh_token',
+            headers={'Authorization': f'Bearer {token}'},
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    assert token_cache.hits == 1
+    assert token_cache.misses == 1
+
+
+def test_embedded_identity_skips_user_lookup(
+    client, user, monkeypatch, count_queries
+):
+    monkeypatch.setattr(security.settings, 'JWT_EMBED_IDENTITY', True)
+    token = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    ).json()['access_token']
+
+    with count_queries() as statements:
+        response = client.post(
+            '/auth/refresh_token',
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert statements == []
+    assert (
+        decode(
+            response.json()['access_token'],
+            options={'verify_signature': False},
+        )['uid']
+        == user.id
+    )
+
+
+def test_embedded_identity_revoked_after_update(client, user, monkeypatch):
+    monkeypatch.setattr(security.settings, 'JWT_EMBED_IDENTITY', True)
+    token = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    ).json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+
+    client.put(
+        f'/users/{user.id}',
+        headers=headers,
+        json={
+            'username': 'Bob',
+            'email': user.email,
+            'password': 'secret',
+        },
+    )
+    response = client.post('/auth/refresh_token', headers=headers)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_embedded_identity_revoked_token_cannot_update(
+    client, user, monkeypatch
+):
+    monkeypatch.setattr(security.settings, 'JWT_EMBED_IDENTITY', True)
+    token = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    ).json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+    payload = {
+        'username': user.username,
+        'email': user.email,
+        'password': 'secret',
+    }
+
+    client.put(f'/users/{user.id}', headers=headers, json=payload)
+    response = client.put(
+        f'/users/{user.id}',
+        headers=headers,
+        json={**payload, 'password': 'hijacked'},
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_embedded_identity_survives_version_cache_reset(
+    client, user, monkeypatch
+):
+    monkeypatch.setattr(security.settings, 'JWT_EMBED_IDENTITY', True)
+    token = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    ).json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+
+    # A fresh worker (or a recycled one) starts with empty caches.
+    security.token_versions.clear()
+    token_cache.clear()
+    response = client.post('/auth/refresh_token', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_embedded_identity_revocation_survives_version_cache_reset(
+    client, user, monkeypatch
+):
+    monkeypatch.setattr(security.settings, 'JWT_EMBED_IDENTITY', True)
+    token = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    ).json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+    client.put(
+        f'/users/{user.id}',
+        headers=headers,
+        json={
+            'username': user.username,
+            'email': user.email,
+            'password': 'secret',
+        },
+    )
+
+    security.token_versions.clear()
+    token_cache.clear()
+    response = client.post('/auth/refresh_token', headers=headers)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_concurrent_revocations_each_bump_the_version(session, user):
+    other_session = AsyncSession(session.bind)
+    statement = revoke_tokens(update(User).where(User.id == user.id))
+
+    await session.execute(statement)
+    await session.commit()
+    await other_session.execute(statement)
+    await other_session.commit()
+    await other_session.close()
+
+    version = await session.scalar(
+        select(User.token_version).where(User.id == user.id)
+    )
+    assert version == 2  # noqa: PLR2004
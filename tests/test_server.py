@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from fast_zero import server
+from fast_zero.settings import get_settings
+
+
+@pytest.fixture
+def uvicorn_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        server.uvicorn,
+        'run',
+        lambda app, **kw: calls.append((app, kw, get_settings())),
+    )
+    monkeypatch.delenv('WARM_ON_STARTUP', raising=False)
+    get_settings.cache_clear()
+    yield calls
+    get_settings.cache_clear()
+
+
+def test_main_runs_uvicorn_workers(uvicorn_calls):
+    server.main(['--workers', '3', '--max-requests', '0'])
+
+    app, options, settings = uvicorn_calls[0]
+    assert app == 'fast_zero.app:create_app'
+    assert options['factory'] is True
+    assert options['workers'] == 3  # noqa: PLR2004
+    assert options['limit_max_requests'] is None
+    assert options['timeout_graceful_shutdown'] == 30  # noqa: PLR2004
+    assert settings.WARM_ON_STARTUP is True
+
+
+def test_main_keeps_explicit_warm_setting(uvicorn_calls, monkeypatch):
+    monkeypatch.setenv('WARM_ON_STARTUP', 'false')
+
+    server.main(['--workers', '1'])
+
+    assert uvicorn_calls[0][2].WARM_ON_STARTUP is False
+
+
+def test_importing_the_factory_module_does_not_build_an_app():
+    code = (
+        'import fast_zero.app as m; print("app" in vars(m), "app" in dir(m))'
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, 'SECRET_KEY': 'test-secret'},
+    )
+
+    assert result.stdout.split() == ['False', 'True']
@@ -0,0 +1,92 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from fast_zero.app import app
+from fast_zero.database import get_session, get_session_factory
+from fast_zero.models import User
+from fast_zero.projections import fetch_user_row_coalesced
+from fast_zero.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight('test')
+    calls = 0
+
+    async def lookup():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 'user'
+
+    results = await asyncio.gather(
+        *(flight.do('key', lookup) for _ in range(10))
+    )
+
+    assert results == ['user'] * 10
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_not_cached():
+    flight = SingleFlight('test')
+
+    async def failing():
+        await asyncio.sleep(0)
+        raise LookupError('boom')
+
+    results = await asyncio.gather(
+        flight.do('key', failing),
+        flight.do('key', failing),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, LookupError) for result in results)
+    assert await flight.do('key', lambda: asyncio.sleep(0)) is None
+
+
+@pytest.mark.asyncio
+async def test_500_concurrent_profile_reads_run_one_query(
+    session, user, count_queries
+):
+    app.dependency_overrides[get_session] = lambda: session
+    app.dependency_overrides[get_session_factory] = lambda: (
+        async_sessionmaker(session.bind, expire_on_commit=False)
+    )
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url='http://test') as ac:
+        with count_queries() as statements:
+            responses = await asyncio.gather(
+                *(ac.get(f'/users/{user.id}') for _ in range(500))
+            )
+
+    app.dependency_overrides.clear()
+
+    assert {response.status_code for response in responses} == {HTTPStatus.OK}
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_coalesced_lookup_survives_a_cancelled_leader(session, user):
+    session_factory = async_sessionmaker(session.bind, expire_on_commit=False)
+    key, criteria = ('id', user.id), User.id == user.id
+
+    leader = asyncio.ensure_future(
+        fetch_user_row_coalesced(session_factory, key, criteria)
+    )
+    await asyncio.sleep(0)
+    joiner = asyncio.ensure_future(
+        fetch_user_row_coalesced(session_factory, key, criteria)
+    )
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    row = await joiner
+
+    assert leader.cancelled()
+    assert row.id == user.id
@@ -1,5 +1,9 @@
+import json
 from http import HTTPStatus
-from fast_zero.fast_zero.schemas import UserPublic
+from fast_zero import security
+from fast_zero.hashing import HashingExecutor
+from fast_zero.schemas import UserPublic
+from fast_zero.routers import users as users_router
 
 
 def test_create_user(client):
@@ -40,13 +44,24 @@ def test_create_user_error_409_email(client, user):
     assert response.status_code == HTTPStatus.CONFLICT
     assert response.json() == {'detail': f'Usuário com username alice ou email {user.email} já existe.'}
 
+def test_create_user_error_409_case_insensitive(client, user):
+    response = client.post(
+        '/users/',
+        json={
+            'username': user.username.upper(),
+            'email': 'other@example.com',
+            'password': 'secret',
+        },
+    )
+
+    assert response.status_code == HTTPStatus.CONFLICT
+
+
 def test_read_users(client):
     response = client.get('/users/')
 
-    assert response.status_code == HTTPStatus.OK
-    assert response.json() == {
-        'users': []
-    }
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json() == {'detail': 'Not authenticated'}
 
 
 def test_read_users_with_users(client, user, token):
@@ -77,9 +92,10 @@ def test_update_user(client, user, token):
     }
 
 
-def test_update_user_id_not_found(client):
+def test_update_user_id_not_found(client, token):
     response = client.put(
         '/users/999',
+        headers={'Authorization': f'Bearer {token}'},
         json={
             'username': 'Bob',
             'email': 'bob@example.com',
@@ -87,10 +103,8 @@ def test_update_user_id_not_found(client):
         },
     )
 
-    assert response.status_code == HTTPStatus.NOT_FOUND
-    assert response.json() == {
-        'detail': 'Usuário com id 999 não encontrado.'
-    }
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert response.json() == {'detail': 'Sem permissões suficientes.'}
 
 
 def test_update_integrity_error(client, user, other_user, token):
@@ -106,7 +120,7 @@ def test_update_integrity_error(client, user, other_user, token):
 
     assert response_update.status_code == HTTPStatus.CONFLICT
     assert response_update.json() == {
-        'detail': 'Username or Email already exists'
+        'detail': 'Username ou email já existe.'
     }
 
 
@@ -120,13 +134,19 @@ def test_delete_user(client, user, token):
     assert response.json() == {'message': 'User deleted'}
 
 
-def test_delete_user_id_not_found(client):
-    response = client.delete('/users/999')
+def test_delete_user_id_not_found(client, token):
+    response = client.delete(
+        '/users/999', headers={'Authorization': f'Bearer {token}'}
+    )
 
-    assert response.status_code == HTTPStatus.NOT_FOUND
-    assert response.json() == {
-        'detail': 'Usuário com id 999 não encontrado.'
-    }
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert response.json() == {'detail': 'Sem permissões suficientes.'}
+
+
+def test_delete_user_requires_auth(client, user):
+    response = client.delete(f'/users/{user.id}')
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
 
 
 def test_read_user_by_id(client, user):
@@ -160,7 +180,7 @@ def test_update_user_with_wrong_user(client, other_user, token):
         },
     )
     assert response.status_code == HTTPStatus.FORBIDDEN
-    assert response.json() == {'detail': 'Not enough permissions'}
+    assert response.json() == {'detail': 'Sem permissões suficientes.'}
 
 
 def test_delete_user_wrong_user(client, other_user, token):
@@ -169,4 +189,259 @@ def test_delete_user_wrong_user(client, other_user, token):
         headers={'Authorization': f'Bearer {token}'},
     )
     assert response.status_code == HTTPStatus.FORBIDDEN
-    assert response.json() == {'detail': 'Not enough permissions'}
+    assert response.json() == {'detail': 'Sem permissões suficientes.'}
+
+
+def test_read_users_with_cursor(client, user, other_user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    first_page = client.get('/users/?limit=1', headers=headers).json()
+    second_page = client.get(
+        f'/users/?limit=1&cursor={first_page["next_cursor"]}',
+        headers=headers,
+    ).json()
+    last_page = client.get(
+        f'/users/?limit=1&cursor={second_page["next_cursor"]}',
+        headers=headers,
+    ).json()
+
+    assert [u['id'] for u in first_page['users']] == [user.id]
+    assert [u['id'] for u in second_page['users']] == [other_user.id]
+    assert last_page == {'users': []}
+
+
+def test_read_users_invalid_cursor(client, token):
+    response = client.get(
+        '/users/?cursor=not-a-cursor',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Cursor inválido.'}
+
+
+def test_read_users_not_modified(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    first = client.get('/users/', headers=headers)
+
+    response = client.get(
+        '/users/',
+        headers={**headers, 'If-None-Match': first.headers['ETag']},
+    )
+
+    assert first.headers['ETag'].startswith('W/')
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b''
+
+
+def test_read_users_etag_changes_with_page(client, user, other_user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    first_page = client.get('/users/?limit=1', headers=headers)
+    both = client.get('/users/?limit=2', headers=headers)
+
+    assert first_page.headers['ETag'] != both.headers['ETag']
+
+
+def test_export_users_ndjson(client, user, other_user, token):
+    response = client.get(
+        '/users/export',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {'id': user.id, 'username': user.username, 'email': user.email},
+        {
+            'id': other_user.id,
+            'username': other_user.username,
+            'email': other_user.email,
+        },
+    ]
+
+
+def test_export_users_csv(client, user, token):
+    response = client.get(
+        '/users/export?format=csv',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/csv')
+    assert response.text.splitlines() == [
+        'id,username,email',
+        f'{user.id},{user.username},{user.email}',
+    ]
+
+
+def test_create_users_bulk(client, user, token):
+    response = client.post(
+        '/users/bulk',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'users': [
+                {
+                    'username': 'alice',
+                    'email': 'alice@example.com',
+                    'password': 'secret',
+                },
+                {
+                    'username': user.username,
+                    'email': 'taken@example.com',
+                    'password': 'secret',
+                },
+                {
+                    'username': 'alice2',
+                    'email': 'alice@example.com',
+                    'password': 'secret',
+                },
+            ]
+        },
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.json() == {
+        'created': [
+            {
+                'id': user.id + 1,
+                'username': 'alice',
+                'email': 'alice@example.com',
+            }
+        ],
+        'conflicts': [
+            {
+                'index': 1,
+                'username': user.username,
+                'email': 'taken@example.com',
+                'detail': 'Username ou email já existe.',
+            },
+            {
+                'index': 2,
+                'username': 'alice2',
+                'email': 'alice@example.com',
+                'detail': 'Username ou email já existe.',
+            },
+        ],
+    }
+
+
+def test_create_users_bulk_conflicts_ignore_case(client, user, token):
+    response = client.post(
+        '/users/bulk',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'users': [
+                {
+                    'username': user.username.upper(),
+                    'email': 'new@example.com',
+                    'password': 'secret',
+                },
+                {
+                    'username': 'alice',
+                    'email': 'Alice@Example.com',
+                    'password': 'secret',
+                },
+                {
+                    'username': 'alice2',
+                    'email': 'alice@example.com',
+                    'password': 'secret',
+                },
+            ]
+        },
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    body = response.json()
+    assert [user['username'] for user in body['created']] == ['alice']
+    assert [conflict['index'] for conflict in body['conflicts']] == [0, 2]
+
+
+def test_create_users_bulk_requires_auth(client):
+    response = client.post(
+        '/users/bulk',
+        json={
+            'users': [
+                {
+                    'username': 'alice',
+                    'email': 'alice@example.com',
+                    'password': 'secret',
+                }
+            ]
+        },
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_create_users_bulk_larger_than_hashing_capacity(
+    client, token, monkeypatch
+):
+    executor = HashingExecutor('thread', max_workers=1, max_pending=1)
+    monkeypatch.setattr(security, 'hashing_executor', executor)
+    response = client.post(
+        '/users/bulk',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'users': [
+                {
+                    'username': f'user{n}',
+                    'email': f'user{n}@example.com',
+                    'password': 'secret',
+                }
+                for n in range(3)
+            ]
+        },
+    )
+    executor.shutdown()
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert len(response.json()['created']) == 3  # noqa: PLR2004
+
+
+def test_create_user_statement_count(client, count_queries):
+    with count_queries() as statements:
+        response = client.post(
+            '/users/',
+            json={
+                'username': 'Alice',
+                'password': 'secret',
+                'email': 'alice@example.com',
+            },
+        )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert len(statements) == 1
+    assert 'ON CONFLICT DO NOTHING' in statements[0]
+    assert 'RETURNING' in statements[0]
+
+
+def test_update_user_statement_count(client, user, token, count_queries):
+    with count_queries() as statements:
+        response = client.put(
+            f'/users/{user.id}',
+            headers={'Authorization': f'Bearer {token}'},
+            json={
+                'username': 'Bob',
+                'email': 'bob@example.com',
+                'password': 'secret',
+            },
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(statements) == 2  # noqa: PLR2004
+    assert 'RETURNING' in statements[-1]
+
+
+def test_read_users_fast_json(client, user, token, monkeypatch):
+    monkeypatch.setattr(users_router.settings, 'FAST_JSON_RESPONSES', True)
+
+    response = client.get(
+        '/users/', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'users': [
+            {'id': user.id, 'username': user.username, 'email': user.email}
+        ]
+    }
@@ -0,0 +1,96 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from fast_zero.writebehind import LoginTracker
+
+
+def make_tracker(session, **options):
+    @asynccontextmanager
+    async def session_factory():
+        yield session
+
+    tracker = LoginTracker(
+        flush_interval=options.get('flush_interval', 60),
+        batch_size=options.get('batch_size', 100),
+        max_pending=options.get('max_pending', 100),
+    )
+    tracker.session_factory = session_factory
+    return tracker
+
+
+@pytest.mark.asyncio
+async def test_flush_coalesces_events_into_one_statement(
+    session, user, other_user, count_queries
+):
+    tracker = make_tracker(session)
+    for user_id in (user.id, user.id, other_user.id):
+        await tracker.record(user_id)
+
+    with count_queries() as statements:
+        flushed = await tracker.flush()
+
+    await session.refresh(user)
+    assert flushed == 3  # noqa: PLR2004
+    assert len([s for s in statements if s.startswith('UPDATE')]) == 1
+    assert user.login_count == 2  # noqa: PLR2004
+    assert user.last_login_at is not None
+    assert tracker.pending == {}
+
+
+@pytest.mark.asyncio
+async def test_full_queue_flushes_before_accepting(session, user, other_user):
+    tracker = make_tracker(session, max_pending=1)
+
+    await tracker.record(user.id)
+    await tracker.record(other_user.id)
+
+    await session.refresh(user)
+    assert list(tracker.pending) == [other_user.id]
+    assert user.login_count == 1
+
+
+@pytest.mark.asyncio
+async def test_flush_without_session_factory_drops_batch():
+    tracker = LoginTracker(flush_interval=1, batch_size=10, max_pending=10)
+
+    await tracker.record(1)
+
+    assert await tracker.flush() == 0
+    assert tracker.pending == {}
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_in_flight_flush(session, user):
+    tracker = make_tracker(session, batch_size=1)
+    tracker.start(tracker.session_factory)
+    await tracker.record(user.id)
+    await asyncio.sleep(0)
+
+    await tracker.stop()
+
+    await session.refresh(user)
+    assert user.login_count == 1
+    assert tracker.pending == {}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_flush_requeues_batch(user):
+    @asynccontextmanager
+    async def hanging_session():
+        await asyncio.Event().wait()
+        yield
+
+    tracker = LoginTracker(flush_interval=60, batch_size=10, max_pending=10)
+    tracker.session_factory = hanging_session
+    await tracker.record(user.id)
+
+    flush = asyncio.ensure_future(tracker.flush())
+    await asyncio.sleep(0)
+    assert tracker.pending == {}
+    flush.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await flush
+
+    assert tracker.pending[user.id][0] == 1